@@ -2,7 +2,7 @@ import os
 import time
 import platform
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -74,8 +74,18 @@ def crawl():
     print(f"Navigating to {url}")
     driver.get(url)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    time.sleep(3)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    # Wait for the news results instead of sleeping a fixed time
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.SoAPf"))
+        )
+        print(f"Results ready after {time.monotonic() - started:.2f}s")
+    except TimeoutException:
+        print(f"No results after {time.monotonic() - started:.2f}s, continuing")
+    # Only parse the news results, not the whole Google page
+    only_results = SoupStrainer("div", class_=lambda c: c and "SoAPf" in c.split())
+    soup = BeautifulSoup(driver.page_source, "html.parser", parse_only=only_results)
     articles = []
 
     for result in soup.select("div.SoAPf"):
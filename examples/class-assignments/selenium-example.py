@@ -118,7 +118,15 @@ def crawl():
     print(f"Navigating to {url}")
     driver.get(url)
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-    time.sleep(3)
+    # Wait for the article body instead of sleeping a fixed time
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ".article-content"))
+        )
+        print(f"Article ready after {time.monotonic() - started:.2f}s")
+    except TimeoutException:
+        print(f"Article not ready after {time.monotonic() - started:.2f}s, continuing")
 
     print("Extracting video URLs...")
     video_urls = extract_video_urls(driver)
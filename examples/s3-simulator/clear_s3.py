@@ -1,54 +1,92 @@
 #!/usr/bin/env python3
 
+import argparse
 import boto3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-def clear_s3_bucket():
-    """Clear all files from S3 bucket using LocalStack"""
-    
-    print("Clearing all files from S3 bucket...")
-    
+# delete_objects takes at most 1000 keys, the same as a list_objects_v2 page
+DELETE_BATCH_SIZE = 1000
+DEFAULT_CONCURRENCY = 8
+
+def delete_batch(s3_client, bucket_name, keys):
+    """Delete up to 1000 keys in one call; returns (deleted, errors)"""
+    # Quiet mode: the response only lists the keys that could not be deleted
+    delete_response = s3_client.delete_objects(
+        Bucket=bucket_name,
+        Delete={'Objects': [{'Key': key} for key in keys], 'Quiet': True}
+    )
+    errors = delete_response.get('Errors', [])
+    return len(keys) - len(errors), errors
+
+def iter_key_batches(s3_client, bucket_name, prefix=''):
+    """Every key under prefix, in batches of up to 1000, one list page at a time"""
+    paginator = s3_client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=bucket_name,
+        Prefix=prefix,
+        PaginationConfig={'PageSize': DELETE_BATCH_SIZE}
+    )
+    for page in pages:
+        keys = [obj['Key'] for obj in page.get('Contents', [])]
+        if keys:
+            yield keys
+
+def clear_s3_bucket(bucket_name='test-bucket', prefix='', concurrency=DEFAULT_CONCURRENCY, verbose=False):
+    """Clear all files (or those under prefix) from S3 bucket using LocalStack"""
+
+    target = f"s3://{bucket_name}/{prefix}"
+    print(f"Clearing all files from {target}...")
+
     s3_client = boto3.client(
         's3',
         endpoint_url='http://localhost:4566',
         aws_access_key_id='test',
         aws_secret_access_key='test',
-        region_name='us-east-1'
+        region_name='us-east-1',
+        config=Config(max_pool_connections=max(concurrency, 10), retries={'max_attempts': 5, 'mode': 'adaptive'})
     )
-    
-    bucket_name = 'test-bucket'
-    
+
+    deleted_count = 0
+    errors = []
+    started = time.perf_counter()
+
     try:
-        # List all objects in the bucket
-        response = s3_client.list_objects_v2(Bucket=bucket_name)
-        
-        if 'Contents' not in response:
-            print("✅ Bucket is already empty")
+        # Listing stays sequential (each page needs the previous token); the
+        # deletes of the pages already listed run while the next one loads
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = []
+            for keys in iter_key_batches(s3_client, bucket_name, prefix):
+                futures.append((executor.submit(delete_batch, s3_client, bucket_name, keys), keys))
+
+            for future, keys in futures:
+                batch_deleted, batch_errors = future.result()
+                deleted_count += batch_deleted
+                errors.extend(batch_errors)
+                if verbose:
+                    failed_keys = {error['Key'] for error in batch_errors}
+                    for key in keys:
+                        if key not in failed_keys:
+                            print(f"  - Deleted: {key}")
+
+        if deleted_count == 0 and not errors:
+            print("✅ Bucket is already empty" if not prefix else f"✅ No files under {target}")
             return
-        
-        # Delete all objects
-        objects_to_delete = [{'Key': obj['Key']} for obj in response['Contents']]
-        
-        if objects_to_delete:
-            delete_response = s3_client.delete_objects(
-                Bucket=bucket_name,
-                Delete={'Objects': objects_to_delete}
-            )
-            
-            deleted_count = len(delete_response.get('Deleted', []))
-            print(f"✅ Successfully deleted {deleted_count} files from s3://{bucket_name}")
-            
-            # List deleted files
-            for deleted in delete_response.get('Deleted', []):
-                print(f"  - Deleted: {deleted['Key']}")
-        
+
+        elapsed = time.perf_counter() - started
+        print(f"✅ Successfully deleted {deleted_count} files from {target} in {elapsed:.2f}s "
+              f"({deleted_count / elapsed:.0f} files/sec)")
+
         # Check for any deletion errors
-        if 'Errors' in delete_response:
-            print("❌ Some files failed to delete:")
-            for error in delete_response['Errors']:
+        if errors:
+            print(f"❌ {len(errors)} files failed to delete:")
+            for error in errors:
                 print(f"  - {error['Key']}: {error['Message']}")
-                
+            sys.exit(1)
+
     except ClientError as e:
         error_code = e.response['Error']['Code']
         if error_code == 'NoSuchBucket':
@@ -61,5 +99,16 @@ def clear_s3_bucket():
         print(f"Unexpected error: {e}")
         sys.exit(1)
 
+def main():
+    parser = argparse.ArgumentParser(description='Delete every file in the LocalStack S3 bucket')
+    parser.add_argument('--bucket', default='test-bucket', help='bucket to clear (default: test-bucket)')
+    parser.add_argument('--prefix', default='', help='only delete keys starting with this prefix')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'delete_objects batches in flight (default: {DEFAULT_CONCURRENCY})')
+    parser.add_argument('--verbose', action='store_true', help='print every deleted key')
+    args = parser.parse_args()
+
+    clear_s3_bucket(args.bucket, args.prefix, args.concurrency, args.verbose)
+
 if __name__ == "__main__":
-    clear_s3_bucket()
\ No newline at end of file
+    main()
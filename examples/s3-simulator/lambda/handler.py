@@ -3,20 +3,53 @@ import os
 import json
 import time
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import sys
+from http.server import BaseHTTPRequestHandler
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# pooled_server.py is shared by both simulators: copied next to this file in
+# the container, found in ../../simulator-common when run from the repo
+try:
+    from pooled_server import PooledHTTPServer
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'simulator-common'))
+    from pooled_server import PooledHTTPServer
+
+# Shared by every invocation and request thread: pooled connections, bounded
+# retries with backoff, and timeouts instead of hanging on a dead endpoint
+BOTO_CONFIG = Config(
+    max_pool_connections=int(os.getenv('BOTO_MAX_POOL_CONNECTIONS', 50)),
+    retries={'max_attempts': int(os.getenv('BOTO_MAX_ATTEMPTS', 5)), 'mode': 'adaptive'},
+    connect_timeout=float(os.getenv('BOTO_CONNECT_TIMEOUT', 5)),
+    read_timeout=float(os.getenv('BOTO_READ_TIMEOUT', 30)),
+    tcp_keepalive=True
+)
+
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+def get_s3_client():
+    """S3 client built once per process (clients are thread-safe, creating them is not)"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    's3',
+                    endpoint_url=os.getenv('S3_ENDPOINT', 'http://localstack:4566'),
+                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
+                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
+                    region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1'),
+                    config=BOTO_CONFIG
+                )
+    return _s3_client
+
 def lambda_handler(event, context=None):
     """AWS Lambda handler for S3 events"""
     print(f"Received event: {json.dumps(event, indent=2)}")
     
-    s3_client = boto3.client(
-        's3',
-        endpoint_url=os.getenv('S3_ENDPOINT', 'http://localstack:4566'),
-        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
-        region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-    )
+    s3_client = get_s3_client()
     
     try:
         if 'Records' in event:
@@ -63,13 +96,7 @@ class LambdaHTTPHandler(BaseHTTPRequestHandler):
         """Handle GET requests to list S3 files"""
         try:
             if self.path == '/files':
-                s3_client = boto3.client(
-                    's3',
-                    endpoint_url=os.getenv('S3_ENDPOINT', 'http://localstack:4566'),
-                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
-                    region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-                )
+                s3_client = get_s3_client()
                 
                 bucket_name = os.getenv('S3_BUCKET', 'test-bucket')
                 
@@ -153,13 +180,16 @@ def main():
     port = int(os.getenv('LAMBDA_PORT', 8080))
     print(f"🚀 Lambda function server starting on port {port}...")
     
-    server = HTTPServer(('0.0.0.0', port), LambdaHTTPHandler)
+    workers = int(os.getenv('LAMBDA_WORKERS', 32))
+    server = PooledHTTPServer(('0.0.0.0', port), LambdaHTTPHandler, max_workers=workers)
+    print(f"   Handling up to {workers} requests concurrently")
     
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down lambda function...")
-        server.shutdown()
+    finally:
+        server.server_close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of the HTML parser backends in utils/html_parsers.py.
+
+Usage:
+    python bench_html_parsers.py [saved_page.html ...]
+
+Save a portal page with e.g. ``curl https://prices.mega.co.il/ > mega.html``
+(or ``driver.page_source`` from the Selenium crawler). Without arguments a
+synthetic page with a few thousand rows is generated instead.
+"""
+
+import statistics
+import sys
+import time
+
+from utils.html_parsers import available_backends, extract_links
+
+REPEAT = 20
+
+
+def synthetic_page(rows=3000):
+    """A price portal-like page: a big table with one download button per row"""
+    body = []
+    for i in range(rows):
+        body.append(
+            "<tr>"
+            f"<td class='name'>PriceFull7290055700007-{i:04d}-202510180300</td>"
+            f"<td><span class='size'>{i * 17} KB</span></td>"
+            "<td><a class='downloadBtn btn' "
+            f"href='/files/PriceFull7290055700007-{i:04d}-202510180300.gz'>"
+            "Download</a></td>"
+            "<td><a class='details' href='#'>Details</a></td>"
+            "</tr>"
+        )
+    return (
+        "<html><head><title>Prices</title></head><body>"
+        "<select id='branch_filter'><option value='0084'>0084</option></select>"
+        f"<table>{''.join(body)}</table>"
+        "</body></html>"
+    )
+
+
+def bench(html, backend):
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        links = extract_links(html, backend=backend)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), links
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = []
+        for path in sys.argv[1:]:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append((path, f.read()))
+    else:
+        pages = [("synthetic page", synthetic_page())]
+
+    backends = available_backends()
+    for name, html in pages:
+        print(f"\n{name} ({len(html) / 1024:.0f} KB)")
+        baseline, expected = bench(html, "html.parser")
+        for backend in backends:
+            median, links = bench(html, backend)
+            status = "ok" if links == expected else "MISMATCH"
+            print(
+                f"  {backend:<12} {median * 1000:8.2f} ms  "
+                f"{baseline / median:5.1f}x  {len(links)} links  {status}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import os
 import requests
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
-from utils import download_file_from_link, extract_and_delete_gz, convert_xml_to_json
+from bs4 import BeautifulSoup, SoupStrainer
+from utils.downloader import PriceFileDownloader
+from utils.html_parsers import has_class
+from utils.manifest import CrawlManifest
 
 
 def crawl():
@@ -15,27 +17,32 @@ def crawl():
         print(f"Failed to fetch page. Status code: {response.status_code}")
         return
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    price_tags = soup.find_all("a", class_="downloadBtn")
+    # Only build a tree for the download buttons, not the whole page
+    only_links = SoupStrainer("a", class_=has_class("downloadBtn"))
+    soup = BeautifulSoup(response.text, "html.parser", parse_only=only_links)
+    price_tags = soup.find_all("a")
     
     output_dir = "prices"
     os.makedirs(output_dir, exist_ok=True)
 
+    links = []
     for a_tag in price_tags:
         if a_tag and a_tag.has_attr("href"):
             href = a_tag["href"]
-            link = urljoin(download_base_url, href)
-            print(f"Downloading {link}...")
-            output_path = download_file_from_link(link, output_dir)
-            print(f"Output path: {output_path}")
-            if output_path:
-                print(f"Extracting {output_path}...")
-                output_path = extract_and_delete_gz(output_path)
-                if output_path:
-                    convert_xml_to_json(output_path)
+            links.append(urljoin(download_base_url, href))
         else:
             print("Download link not found.")
 
+    print(f"Downloading {len(links)} files...")
+    with CrawlManifest() as manifest:
+        with PriceFileDownloader(manifest=manifest) as downloader:
+            summary = downloader.download_all(links, output_dir)
+    print(
+        f"{summary['successful_downloads']} successful, "
+        f"{summary['skipped_downloads']} unchanged, "
+        f"{summary['failed_downloads']} failed"
+    )
+
 
 if __name__ == "__main__":
     crawl()
@@ -0,0 +1 @@
+# Makes `utils` importable from tests/ when pytest runs from this directory
@@ -1,21 +1,31 @@
+import argparse
 import os
-import time
 import platform
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
-from utils import (
-    convert_xml_to_json,
-    download_file_from_link,
-    extract_and_delete_gz,
-)
+from utils.downloader import PriceFileDownloader
+from utils.html_parsers import extract_links
+from utils.http_backend import HttpPortalBackend
+from utils.manifest import CrawlManifest
+from utils.parse_stage import ParseStage
+from utils.waits import snapshot_links, wait_for_links_update
+from utils.webdriver_pool import WebDriverPool
+
+PORTAL_URL = "https://prices.mega.co.il/"
+# this sometimes changes so if it failed take a look at the page and update the url
+DOWNLOAD_BASE_URL = "https://prices.carrefour.co.il/"
+CATEGORIES = [
+    {"value": "pricefull", "name": "PriceFull"},
+    {"value": "promofull", "name": "PromoFull"},
+]
 
 
 def init_chrome_options():
@@ -120,25 +130,41 @@ def get_next_page_button(driver, current_page):
         return None
 
 
-def get_download_links_from_page(driver, download_base_url):
+def get_download_links_from_page(driver, download_base_url, parser=None):
     """Extract download links from the current page"""
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    price_tags = soup.find_all("a", class_="downloadBtn")
-
-    download_links = []
-    for a_tag in price_tags:
-        if a_tag and a_tag.has_attr("href"):
-            href = a_tag["href"]
-            link = urljoin(download_base_url, href)
-            download_links.append(link)
-
-    return download_links
+    # Only the download buttons are parsed, with the fastest installed parser
+    hrefs = extract_links(driver.page_source, backend=parser)
+    return [urljoin(download_base_url, href) for href in hrefs]
 
 
 def crawl_category(
-    driver, category_value, category_name, download_base_url, max_pages, branch_name
+    driver,
+    category_value,
+    category_name,
+    download_base_url,
+    max_pages,
+    branch_name,
+    downloader=None,
+    wait_seconds=0.0,
 ):
-    """Crawl a specific category and return statistics"""
+    """
+    Crawl a specific category and return statistics. ``wait_seconds`` is
+    waiting already spent for this category, e.g. on its branch filter.
+    """
+    if downloader is None:
+        # A downloader just for this category, closed when it is done
+        with PriceFileDownloader() as downloader:
+            return crawl_category(
+                driver,
+                category_value,
+                category_name,
+                download_base_url,
+                max_pages,
+                branch_name,
+                downloader=downloader,
+                wait_seconds=wait_seconds,
+            )
+
     print(f"\n{'='*60}")
     print(f"STARTING CRAWL FOR CATEGORY: {category_name}")
     print(f"{'='*60}")
@@ -146,13 +172,15 @@ def crawl_category(
     # Select category filter
     print(f"Selecting category filter: {category_name}...")
     try:
+        before = snapshot_links(driver)
         category_select = Select(driver.find_element("id", "cat_filter"))
         category_select.select_by_value(category_value)
         print(f"Selected category: {category_name}")
 
-        # Wait for page to update after category selection
-        print("Waiting for page to update after category selection...")
-        time.sleep(3)
+        # Wait for the download list to reload after category selection
+        wait_seconds += wait_for_links_update(
+            driver, before, f"{category_name} category filter"
+        )
     except Exception as e:
         print(f"Error selecting category filter: {e}")
         print("Continuing without category filter...")
@@ -163,6 +191,7 @@ def crawl_category(
 
     total_successful = 0
     total_failed = 0
+    total_skipped = 0
     page_num = 1
 
     while page_num <= max_pages:
@@ -178,26 +207,13 @@ def crawl_category(
             print(f"No download links found on page {page_num}. Stopping.")
             break
 
-        # Download files from current page using existing utils functions
-        for i, link in enumerate(download_links, 1):
-            print(f"[{i}/{len(download_links)}] Downloading {link}...")
-            output_path = download_file_from_link(link, output_dir)
-            print(f"Output path: {output_path}")
-
-            if output_path:
-                try:
-                    print(f"Extracting {output_path}...")
-                    output_path = extract_and_delete_gz(output_path)
-                    if output_path:
-                        convert_xml_to_json(output_path)
-                        total_successful += 1
-                        print(f"✅ Successfully processed: {output_path}")
-                except Exception as e:
-                    print(f"❌ Error processing {output_path}: {e}")
-                    total_failed += 1
-            else:
-                total_failed += 1
-                print(f"❌ Failed to download: {link}")
+        # Download all files from the current page concurrently
+        summary = downloader.download_all(download_links, output_dir)
+        total_successful += summary["successful_downloads"]
+        total_failed += summary["failed_downloads"]
+        total_skipped += summary["skipped_downloads"]
+        for link in summary["failed_links"]:
+            print(f"❌ Failed to download: {link}")
 
         print(f"Page {page_num} summary: {len(download_links)} files processed")
 
@@ -211,8 +227,11 @@ def crawl_category(
                     print(
                         f"Found next page button. Clicking to navigate to page {page_num + 1}..."
                     )
+                    before = snapshot_links(driver)
                     next_button.click()
-                    time.sleep(3)  # Wait for page to load
+                    wait_seconds += wait_for_links_update(
+                        driver, before, f"{category_name} page {page_num + 1}"
+                    )
                     page_num += 1
                 else:
                     print("No next page button found or it's disabled. Stopping.")
@@ -231,22 +250,24 @@ def crawl_category(
     print(f"Total pages processed: {page_num}")
     print(f"Total successful downloads: {total_successful}")
     print(f"Total failed downloads: {total_failed}")
+    print(f"Total unchanged files skipped: {total_skipped}")
+    print(f"Total time waiting for page updates: {wait_seconds:.2f}s")
     print(f"Output directory: {output_dir}")
 
     return {
+        "branch": branch_name,
         "category": category_name,
         "pages_processed": page_num,
         "successful_downloads": total_successful,
         "failed_downloads": total_failed,
+        "skipped_downloads": total_skipped,
+        "wait_seconds": wait_seconds,
         "output_dir": output_dir,
     }
 
 
-def crawl():
-    url = "https://prices.mega.co.il/"
-    download_base_url = "https://prices.carrefour.co.il/"  # this sometimes changes so if it failed take a look at the page and update the url
-    max_pages = 2
-
+def create_driver():
+    """Start a headless Chrome driver"""
     chrome_options = init_chrome_options()
 
     # Automatically download and manage Chrome driver
@@ -254,73 +275,362 @@ def crawl():
     try:
         chromedriver_path = get_chromedriver_path()
         service = Service(chromedriver_path)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        return webdriver.Chrome(service=service, options=chrome_options)
     except Exception as e:
         print(f"Failed to initialize Chrome driver: {e}")
         print("Trying alternative approach...")
         # Alternative approach without service
-        driver = webdriver.Chrome(options=chrome_options)
+        return webdriver.Chrome(options=chrome_options)
 
-    try:
-        print(f"Navigating to {url}")
-        driver.get(url)
 
-        # Select branch with value "0084"
-        print("Selecting branch...")
-        select = Select(driver.find_element("id", "branch_filter"))
-        select.select_by_value("0084")
+def get_branch_values(driver):
+    """Return the value of every branch in the branch filter"""
+    select = Select(driver.find_element("id", "branch_filter"))
+    values = [option.get_attribute("value") for option in select.options]
+    return [value for value in values if value]
+
+
+def select_branch(driver, branch_value):
+    """
+    Select a branch in the branch filter and return its display name and how
+    long the list took to reload
+    """
+    print(f"Selecting branch {branch_value}...")
+    select = Select(driver.find_element("id", "branch_filter"))
+    if select.first_selected_option.get_attribute("value") == branch_value:
+        # Re-selecting it fires no change event, the list is already loaded
         branch_name = select.first_selected_option.text.strip()
-        print(f"Selected branch: {branch_name}")
+        print(f"Branch already selected: {branch_name}")
+        return branch_name, 0.0
+    before = snapshot_links(driver)
+    select.select_by_value(branch_value)
+    branch_name = select.first_selected_option.text.strip()
+    print(f"Selected branch: {branch_name}")
 
-        # Wait for page to update
-        print("Waiting for page to update...")
-        time.sleep(3)
+    # Wait for the download list to reload for the new branch
+    wait_seconds = wait_for_links_update(driver, before, f"branch {branch_name}")
+    return branch_name, wait_seconds
 
-        # Define categories to crawl
-        categories = [
-            {"value": "pricefull", "name": "PriceFull"},
-            {"value": "promofull", "name": "PromoFull"},
-        ]
+
+def print_crawl_summary(all_results):
+    print(f"\n{'='*60}")
+    print("FINAL CRAWLING SUMMARY")
+    print(f"{'='*60}")
+
+    total_successful = sum(r["successful_downloads"] for r in all_results)
+    total_failed = sum(r["failed_downloads"] for r in all_results)
+    total_pages = sum(r["pages_processed"] for r in all_results)
+
+    for result in all_results:
+        print(
+            f"{result['branch']} / {result['category']}: "
+            f"{result['successful_downloads']} successful, "
+            f"{result['failed_downloads']} failed, "
+            f"{result['pages_processed']} pages"
+        )
+
+    print(
+        f"\nTOTAL: {total_successful} successful, {total_failed} failed, "
+        f"{total_pages} pages processed"
+    )
+    print(f"Categories processed: {len(all_results)}")
+    total_wait = sum(r["wait_seconds"] for r in all_results)
+    print(f"Time spent waiting for page updates: {total_wait:.2f}s")
+
+
+def crawl():
+    max_pages = 2
+
+    # Remember ETag/Last-Modified per URL so unchanged files are skipped
+    manifest = CrawlManifest()
+    downloader = PriceFileDownloader(manifest=manifest)
+    driver = create_driver()
+
+    try:
+        print(f"Navigating to {PORTAL_URL}")
+        driver.get(PORTAL_URL)
+
+        # Select branch with value "0084"
+        branch_name, branch_wait = select_branch(driver, "0084")
 
         all_results = []
 
-        # Crawl each category
-        for category in categories:
+        # Crawl each category; the branch wait is counted with the first one
+        for category in CATEGORIES:
             result = crawl_category(
                 driver=driver,
                 category_value=category["value"],
                 category_name=category["name"],
-                download_base_url=download_base_url,
+                download_base_url=DOWNLOAD_BASE_URL,
                 max_pages=max_pages,
                 branch_name=branch_name,
+                downloader=downloader,
+                wait_seconds=branch_wait,
             )
+            branch_wait = 0.0
             all_results.append(result)
 
-        # Print final summary
-        print(f"\n{'='*60}")
-        print(f"FINAL CRAWLING SUMMARY")
-        print(f"{'='*60}")
-
-        total_successful = sum(r["successful_downloads"] for r in all_results)
-        total_failed = sum(r["failed_downloads"] for r in all_results)
-        total_pages = sum(r["pages_processed"] for r in all_results)
-
-        for result in all_results:
-            print(
-                f"{result['category']}: {result['successful_downloads']} successful, {result['failed_downloads']} failed, {result['pages_processed']} pages"
-            )
-
-        print(
-            f"\nTOTAL: {total_successful} successful, {total_failed} failed, {total_pages} pages processed"
-        )
-        print(f"Categories processed: {len(all_results)}")
+        print_crawl_summary(all_results)
 
     except Exception as e:
         print(f"Error during crawling: {e}")
     finally:
         driver.quit()
+        downloader.close()
+        manifest.close()
         print("Chrome driver closed.")
 
 
+def create_downloader(manifest, parse_workers=None):
+    """
+    The shared downloader and, with ``parse_workers``, the ``ParseStage`` it
+    hands raw files to (None otherwise)
+    """
+    if not parse_workers:
+        return PriceFileDownloader(manifest=manifest), None
+    parse_stage = ParseStage(max_workers=parse_workers)
+    # The manifest tracks the parsed file, since the stage deletes the .gz
+    downloader = PriceFileDownloader(
+        manifest=manifest,
+        convert=False,
+        on_downloaded=parse_stage.submit,
+        final_output_path=parse_stage.output_path,
+    )
+    return downloader, parse_stage
+
+
+def portal_loaded(driver):
+    """Whether the driver's session is alive and still showing the portal"""
+    try:
+        return driver.current_url.startswith(PORTAL_URL) and bool(
+            driver.find_elements("id", "branch_filter")
+        )
+    except WebDriverException:
+        return False
+
+
+def reset_filters(driver):
+    """
+    Put the category filter of an already-loaded portal page back to its
+    first option, so the next selection reloads the list from page 1.
+    Returns how long the reload took.
+    """
+    select = Select(driver.find_element("id", "cat_filter"))
+    if select.first_selected_option == select.options[0]:
+        return 0.0
+    before = snapshot_links(driver)
+    select.select_by_index(0)
+    return wait_for_links_update(driver, before, "reset category filter")
+
+
+def crawl_branch_category(pool, branch_value, category, max_pages, downloader):
+    """
+    Crawl one (branch, category) pair on a driver borrowed from the pool.
+    The driver keeps the portal page loaded between jobs and only its filters
+    are reset; the page is reloaded only if the session went stale.
+    """
+    with pool.acquire() as driver:
+        if portal_loaded(driver):
+            reset_wait = reset_filters(driver)
+        else:
+            print("Portal page is gone, reloading it...")
+            driver.get(PORTAL_URL)
+            reset_wait = 0.0
+        branch_name, branch_wait = select_branch(driver, branch_value)
+        return crawl_category(
+            driver=driver,
+            category_value=category["value"],
+            category_name=category["name"],
+            download_base_url=DOWNLOAD_BASE_URL,
+            max_pages=max_pages,
+            branch_name=branch_name,
+            downloader=downloader,
+            wait_seconds=reset_wait + branch_wait,
+        )
+
+
+def crawl_parallel(
+    branches=None,
+    categories=CATEGORIES,
+    max_drivers=None,
+    max_pages=2,
+    jobs=None,
+    downloader=None,
+    parse_workers=None,
+    print_summary=True,
+):
+    """
+    Crawl many branches and categories in parallel.
+
+    Every (branch, category) pair is a separate job. Jobs are spread over a
+    bounded pool of reusable Chrome drivers (one per CPU core by default),
+    each started and warmed up once. With ``branches=None`` every branch in
+    the branch filter is crawled. Pass ``jobs`` to crawl an explicit list of
+    (branch, category) pairs instead.
+
+    With ``parse_workers`` the raw files are parsed in a separate
+    multi-process stage (see ``ParseStage``) instead of inside the download
+    threads, so big files never hold up the downloads behind them.
+    """
+    max_drivers = max_drivers or os.cpu_count() or 1
+    manifest = None
+    parse_stage = None
+    if downloader is None:
+        manifest = CrawlManifest()
+        downloader, parse_stage = create_downloader(manifest, parse_workers)
+    pool = WebDriverPool(
+        create_driver, size=max_drivers, warm_up=lambda d: d.get(PORTAL_URL)
+    )
+
+    try:
+        if jobs is None:
+            if branches is None:
+                with pool.acquire() as driver:
+                    branches = get_branch_values(driver)
+            jobs = [
+                (branch, category) for branch in branches for category in categories
+            ]
+        print(f"Crawling {len(jobs)} jobs on up to {max_drivers} Chrome drivers...")
+
+        all_results = []
+        with ThreadPoolExecutor(max_workers=max_drivers) as executor:
+            futures = {
+                executor.submit(
+                    crawl_branch_category,
+                    pool,
+                    branch,
+                    category,
+                    max_pages,
+                    downloader,
+                ): (branch, category["name"])
+                for branch, category in jobs
+            }
+            for future in as_completed(futures):
+                branch, category_name = futures[future]
+                try:
+                    all_results.append(future.result())
+                except Exception as e:
+                    print(f"❌ Error crawling {branch} / {category_name}: {e}")
+
+        if print_summary:
+            print_crawl_summary(all_results)
+        return all_results
+    finally:
+        pool.close()
+        if parse_stage is not None:
+            parse_stage.close()
+        if manifest is not None:
+            downloader.close()
+            manifest.close()
+
+
+def crawl_http(
+    branches=None,
+    categories=CATEGORIES,
+    max_pages=2,
+    list_url=None,
+    parse_workers=None,
+    page_size=None,
+):
+    """
+    Crawl without a browser where possible.
+
+    Download links are collected over plain HTTP (see ``HttpPortalBackend``).
+    Only the (branch, category) pairs whose links cannot be found without
+    JavaScript fall back to the Selenium driver pool, and so does the whole
+    crawl if the branch filter cannot be read without JavaScript.
+    ``parse_workers`` works as in ``crawl_parallel``.
+    """
+    manifest = CrawlManifest()
+    downloader, parse_stage = create_downloader(manifest, parse_workers)
+    backend = HttpPortalBackend(
+        PORTAL_URL,
+        DOWNLOAD_BASE_URL,
+        list_url=list_url,
+        session=downloader.session,
+        page_size=page_size,
+    )
+
+    try:
+        branch_names = backend.get_branches()
+        if branches is None and not branch_names:
+            print("No branches over HTTP, falling back to Selenium")
+            return crawl_parallel(
+                categories=categories, max_pages=max_pages, downloader=downloader
+            )
+        if branches is None:
+            branches = list(branch_names)
+
+        all_results = []
+        fallback_jobs = []
+        for branch in branches:
+            for category in categories:
+                links, pages = backend.get_links_and_pages(
+                    branch, category["value"], max_pages
+                )
+                if not links:
+                    print(
+                        f"No links for {branch} / {category['name']} over HTTP, "
+                        "falling back to Selenium"
+                    )
+                    fallback_jobs.append((branch, category))
+                    continue
+
+                branch_name = branch_names.get(branch, branch)
+                output_dir = os.path.join("prices", branch_name)
+                summary = downloader.download_all(links, output_dir)
+                all_results.append(
+                    {
+                        "branch": branch_name,
+                        "category": category["name"],
+                        "pages_processed": pages,
+                        "successful_downloads": summary["successful_downloads"],
+                        "failed_downloads": summary["failed_downloads"],
+                        "skipped_downloads": summary["skipped_downloads"],
+                        "wait_seconds": 0.0,
+                        "output_dir": output_dir,
+                    }
+                )
+
+        if fallback_jobs:
+            all_results.extend(
+                crawl_parallel(
+                    jobs=fallback_jobs,
+                    max_pages=max_pages,
+                    downloader=downloader,
+                    print_summary=False,
+                )
+            )
+        print_crawl_summary(all_results)
+        return all_results
+    finally:
+        if parse_stage is not None:
+            parse_stage.close()
+        downloader.close()
+        manifest.close()
+
+
+def main():
+    # python selenium-example.py [parallel|http] [--parse-workers N] [branch ...]
+    parser = argparse.ArgumentParser(description="Crawl price files")
+    parser.add_argument("mode", nargs="?", choices=["parallel", "http"])
+    parser.add_argument("branches", nargs="*", help="default: every branch")
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="parse in this many processes instead of the download threads",
+    )
+    args = parser.parse_intermixed_args()
+    if args.mode == "parallel":
+        crawl_parallel(
+            branches=args.branches or None, parse_workers=args.parse_workers
+        )
+    elif args.mode == "http":
+        crawl_http(branches=args.branches or None, parse_workers=args.parse_workers)
+    else:
+        crawl()
+
+
 if __name__ == "__main__":
-    crawl()
+    main()
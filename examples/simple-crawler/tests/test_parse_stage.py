@@ -0,0 +1,80 @@
+import functools
+import gzip
+import http.server
+import os
+import threading
+
+import pytest
+
+from utils.downloader import PriceFileDownloader
+from utils.manifest import CrawlManifest
+from utils.parse_stage import ParseStage
+
+PRICE_FILE = "PriceFull7290027600007-084-202501010000.gz"
+PRICE_XML = (
+    b"<Root><ChainId>7290027600007</ChainId><StoreId>084</StoreId>"
+    b"<Items><Item><ItemCode>7290000000001</ItemCode>"
+    b"<ItemPrice>5.90</ItemPrice></Item></Items></Root>"
+)
+
+
+class RecordingHandler(http.server.SimpleHTTPRequestHandler):
+    """Static files with Last-Modified / If-Modified-Since, requests recorded"""
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def price_server(tmp_path):
+    served = tmp_path / "served"
+    served.mkdir()
+    (served / PRICE_FILE).write_bytes(gzip.compress(PRICE_XML))
+
+    handler = functools.partial(RecordingHandler, directory=str(served))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def crawl_with_parse_workers(link, output_dir, manifest_path):
+    """One crawl wired like selenium-example.create_downloader"""
+    parse_stage = ParseStage(max_workers=1)
+    with CrawlManifest(manifest_path) as manifest:
+        with PriceFileDownloader(
+            manifest=manifest,
+            convert=False,
+            on_downloaded=parse_stage.submit,
+            final_output_path=parse_stage.output_path,
+        ) as downloader:
+            summary = downloader.download_all([link], output_dir)
+        parse_stage.close()
+    return summary
+
+
+class TestParseStageCrawl:
+    def test_second_crawl_sends_conditional_request(self, price_server, tmp_path):
+        # Arrange
+        link = f"http://127.0.0.1:{price_server.server_port}/{PRICE_FILE}"
+        output_dir = str(tmp_path / "prices")
+        manifest_path = str(tmp_path / "manifest.sqlite3")
+
+        # Act
+        first = crawl_with_parse_workers(link, output_dir, manifest_path)
+        second = crawl_with_parse_workers(link, output_dir, manifest_path)
+
+        # Assert
+        assert first["successful_downloads"] == 1
+        assert sorted(os.listdir(output_dir)) == [PRICE_FILE[:-3] + ".ndjson"]
+        assert "If-Modified-Since" not in price_server.requests[0]
+        assert "If-Modified-Since" in price_server.requests[1]
+        assert second["skipped_downloads"] == 1
+        assert second["successful_downloads"] == 0
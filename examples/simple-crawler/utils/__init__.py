@@ -5,6 +5,16 @@ import os
 import requests
 import xml.etree.ElementTree as ET
 
+from .xml_stream import (
+    CHUNK_SIZE,
+    OUTPUT_EXTENSIONS,
+    elem_to_dict,
+    iter_gunzip,
+    iter_xml_records,
+    stream_xml_to_json,
+    write_records,
+)
+
 
 def extract_and_delete_gz(gz_path):
     if not gz_path.endswith(".gz"):
@@ -27,26 +37,101 @@ def extract_and_delete_gz(gz_path):
     return output_path
 
 
-def download_file_from_link(link, output_dir):
+def iter_response_chunks(response, chunk_size=8192, hasher=None):
+    """Iterate over a response body, optionally feeding every chunk to a hasher"""
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        if hasher is not None:
+            hasher.update(chunk)
+        yield chunk
+
+
+def save_response(response, output_path, hasher=None):
+    """Write an HTTP response body to ``output_path`` in chunks"""
+    with open(output_path, "wb") as f:
+        for chunk in iter_response_chunks(response, hasher=hasher):
+            f.write(chunk)
+    print(f"Downloaded to {output_path}")
+    return output_path
+
+
+def download_file_from_link(link, output_dir, session=None, timeout=None):
     filename = os.path.basename(link)
     output_path = os.path.join(output_dir, filename)
-    response = requests.get(link, stream=True)
-    if response.status_code == 200:
-        with open(output_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        print(f"Downloaded to {output_path}")
+    http = session or requests
+    with http.get(link, stream=True, timeout=timeout) as response:
+        if response.status_code == 200:
+            return save_response(response, output_path)
+        else:
+            print(f"Failed to download. Status code: {response.status_code}")
+            return None
+
+
+def get_output_path(link, output_dir, output_format="ndjson"):
+    """Build the converted output path for a price file link"""
+    filename = os.path.basename(link)
+    if filename.endswith(".gz"):
+        filename = filename[:-3]
+    return os.path.join(output_dir, filename + OUTPUT_EXTENSIONS[output_format])
+
+
+def convert_response(
+    response, output_path, output_format="ndjson", hasher=None, compression=None
+):
+    """
+    Stream an HTTP response body through gunzip and the XML parser straight
+    into ``output_path``, without writing the .gz or the XML to disk.
+    """
+    chunks = iter_response_chunks(response, CHUNK_SIZE, hasher)
+    records = iter_xml_records(iter_gunzip(chunks))
+    count = write_records(records, output_path, output_format, compression)
+    print(f"✅ Streamed {count} records to {output_path}")
+    return output_path
+
+
+def download_and_convert(
+    link,
+    output_dir,
+    output_format="ndjson",
+    session=None,
+    timeout=None,
+    compression=None,
+):
+    """
+    Download, decompress and convert a price file in a single streaming pass.
+    Skips the download if the converted file already exists.
+    """
+    output_path = get_output_path(link, output_dir, output_format)
+    if os.path.exists(output_path):
+        print(f"✅ Output already exists: {output_path}")
         return output_path
-    else:
-        print(f"Failed to download. Status code: {response.status_code}")
-        return None
+
+    http = session or requests
+    with http.get(link, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            print(f"Failed to download. Status code: {response.status_code}")
+            return None
+        return convert_response(
+            response, output_path, output_format, compression=compression
+        )
 
 
-def convert_xml_to_json(xml_file_path: str):
+def convert_xml_to_json(
+    xml_file_path: str, stream=False, output_format="ndjson", compression=None
+):
     """
     Converts an XML file (even if extensionless) to a JSON file.
     Skips conversion if the JSON file already exists.
+
+    With ``stream=True`` the file is parsed incrementally and every record is
+    written out as soon as it is parsed (``output_format`` is ``"ndjson"``,
+    ``"json"``, ``"parquet"`` or ``"arrow"``), so memory stays flat on large
+    PriceFull files.
     """
+    if stream:
+        return stream_xml_to_json(
+            xml_file_path, output_format, compression=compression
+        )
+
     json_file_path = xml_file_path + ".json"
     if os.path.exists(json_file_path):
         print(f"✅ JSON already exists: {json_file_path}")
@@ -60,30 +145,6 @@ def convert_xml_to_json(xml_file_path: str):
     root = ET.fromstring(xml_data)
 
     # Step 3: Convert recursively
-    def elem_to_dict(elem):
-        result = {elem.tag: {} if elem.attrib else None}
-        children = list(elem)
-        if children:
-            dd = {}
-            for dc in map(elem_to_dict, children):
-                for k, v in dc.items():
-                    if k in dd:
-                        if not isinstance(dd[k], list):
-                            dd[k] = [dd[k]]
-                        dd[k].append(v)
-                    else:
-                        dd[k] = v
-            result = {elem.tag: dd}
-        if elem.attrib:
-            result[elem.tag].update(("@" + k, v) for k, v in elem.attrib.items())
-        if elem.text and elem.text.strip():
-            text = elem.text.strip()
-            if children or elem.attrib:
-                result[elem.tag]["#text"] = text
-            else:
-                result[elem.tag] = text
-        return result
-
     parsed_dict = elem_to_dict(root)
 
     # Step 4: Save to JSON
@@ -91,3 +152,4 @@ def convert_xml_to_json(xml_file_path: str):
         json.dump(parsed_dict, json_file, ensure_ascii=False, indent=2)
 
     print(f"✅ Converted to JSON: {json_file_path}")
+    return json_file_path
@@ -0,0 +1,181 @@
+import os
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+DEFAULT_ROW_GROUP_SIZE = 100_000
+# Arrow files are read memory-mapped (see read_price_table), which only works
+# in place for uncompressed batches
+DEFAULT_COMPRESSION = {"parquet": "zstd", "arrow": "none"}
+
+# column -> (source XML field, type)
+PRICE_COLUMNS = {
+    "chain_id": ("ChainId", "string"),
+    "store_id": ("StoreId", "string"),
+    "item_code": ("ItemCode", "string"),
+    "item_name": ("ItemName", "string"),
+    "manufacturer_name": ("ManufacturerName", "string"),
+    "quantity": ("Quantity", "float"),
+    "unit_qty": ("UnitQty", "string"),
+    "unit_of_measure": ("UnitOfMeasure", "string"),
+    "item_price": ("ItemPrice", "float"),
+    "unit_of_measure_price": ("UnitOfMeasurePrice", "float"),
+    "price_update_date": ("PriceUpdateDate", "timestamp"),
+}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for parquet/arrow output: pip install pyarrow"
+        )
+
+
+def price_schema():
+    _require_pyarrow()
+    types = {
+        "string": pa.string(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("s"),
+    }
+    return pa.schema(
+        [(column, types[kind]) for column, (_, kind) in PRICE_COLUMNS.items()]
+    )
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value):
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.strip().replace("/", "-"))
+    except ValueError:
+        return None
+
+
+def _to_string(value):
+    return value if isinstance(value, str) else None
+
+
+_CONVERTERS = {
+    "string": _to_string,
+    "float": _to_float,
+    "timestamp": _to_timestamp,
+}
+
+
+def normalize_price_records(records):
+    """
+    Turn the records of a PriceFull file (see ``iter_xml_records``) into
+    flat, typed price items.
+
+    Header records (``ChainId``, ``StoreId``, ...) are remembered and copied
+    onto every item. Field names are matched case-insensitively because
+    chains disagree on casing (``StoreId`` / ``StoreID``). Non-item records
+    such as promotions are skipped.
+    """
+    header = {}
+    for record in records:
+        (tag, value), = record.items()
+        if tag.lower() != "item":
+            if isinstance(value, str):
+                header[tag.lower()] = value
+            continue
+        if not isinstance(value, dict):
+            continue
+
+        fields = {key.lower(): field for key, field in value.items()}
+        row = {}
+        for column, (source, kind) in PRICE_COLUMNS.items():
+            raw = fields.get(source.lower(), header.get(source.lower()))
+            row[column] = _CONVERTERS[kind](raw)
+        yield row
+
+
+def _batches(rows, schema, size):
+    columns = {name: [] for name in schema.names}
+    count = 0
+    for row in rows:
+        for name, values in columns.items():
+            values.append(row[name])
+        count += 1
+        if count == size:
+            yield pa.RecordBatch.from_pydict(columns, schema=schema)
+            columns = {name: [] for name in schema.names}
+            count = 0
+    if count:
+        yield pa.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def write_price_table(
+    records,
+    output_path,
+    output_format="parquet",
+    row_group_size=DEFAULT_ROW_GROUP_SIZE,
+    compression=None,
+):
+    """
+    Write price file records as a typed Parquet or Arrow IPC file and return
+    the number of rows.
+
+    Rows are buffered ``row_group_size`` at a time, so memory stays bounded
+    by one row group. ``compression`` defaults to zstd for Parquet and to
+    ``"none"`` for Arrow, whose files are memory-mapped without a
+    decompression step; pass e.g. ``"zstd"`` or ``"lz4"`` to trade that for
+    smaller Arrow files.
+    """
+    _require_pyarrow()
+    if output_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported columnar format: {output_format}")
+    if compression is None:
+        compression = DEFAULT_COMPRESSION[output_format]
+
+    schema = price_schema()
+    rows = normalize_price_records(records)
+    tmp_path = output_path + ".part"
+    count = 0
+    try:
+        if output_format == "parquet":
+            with pq.ParquetWriter(tmp_path, schema, compression=compression) as writer:
+                for batch in _batches(rows, schema, row_group_size):
+                    writer.write_batch(batch, row_group_size=row_group_size)
+                    count += batch.num_rows
+        else:
+            options = pa.ipc.IpcWriteOptions(
+                compression=None if compression == "none" else compression
+            )
+            with pa.OSFile(tmp_path, "wb") as sink:
+                with pa.ipc.new_file(sink, schema, options=options) as writer:
+                    for batch in _batches(rows, schema, row_group_size):
+                        writer.write_batch(batch)
+                        count += batch.num_rows
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def read_price_table(path, columns=None):
+    """
+    Read selected columns of a Parquet / Arrow price file, memory-mapped.
+    Only the requested columns are read from disk.
+    """
+    _require_pyarrow()
+    if path.endswith(".arrow"):
+        # Uncompressed batches are used in place, straight from the mapping
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        return table.select(columns) if columns else table
+    return pq.read_table(path, columns=columns, memory_map=True)
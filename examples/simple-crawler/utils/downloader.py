@@ -0,0 +1,242 @@
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import convert_response, get_output_path, save_response
+
+
+class PriceFileDownloader:
+    """
+    Download many price files concurrently over pooled keep-alive connections.
+
+    All workers share one ``requests.Session`` so TCP/TLS connections are
+    reused between files. Every host gets its own concurrency limit, failed
+    connections and 429/5xx responses are retried with exponential backoff,
+    and by default each file is streamed straight into NDJSON (see
+    ``download_and_convert``). Pass ``convert=False`` to keep the raw files;
+    ``compression`` applies to Parquet / Arrow output.
+
+    With a ``CrawlManifest`` the request for a file already on disk is
+    conditional (ETag / Last-Modified), and files the server reports as
+    unchanged are skipped. Existing outputs without validators are skipped
+    without a request, as they are without a manifest.
+    ``on_downloaded`` is called with the path of every new file, e.g.
+    ``ParseStage.submit`` to parse raw downloads in other processes. When
+    that stage replaces the raw file, ``final_output_path`` (e.g.
+    ``ParseStage.output_path``) maps a download to the file that stays on
+    disk; the manifest and the skip checks then look at that file.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host_limit: int = 4,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: tuple[float, float] = (10, 60),
+        convert: bool = True,
+        output_format: str = "ndjson",
+        compression: str | None = None,
+        manifest=None,
+        on_downloaded=None,
+        final_output_path=None,
+    ):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.convert = convert
+        self.output_format = output_format
+        self.compression = compression
+        self.manifest = manifest
+        self.on_downloaded = on_downloaded
+        self.final_output_path = final_output_path
+        self.session = self._create_session()
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        # urllib3 only retries 429/5xx responses. Connection and read errors
+        # (including transfers that break mid-stream) are retried once, by the
+        # loop in _download, so the two layers never multiply.
+        retry_strategy = Retry(
+            total=self.retries,
+            connect=0,
+            read=0,
+            other=0,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=retry_strategy,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"User-Agent": "Mozilla/5.0"})
+        return session
+
+    def _host_limit(self, link: str) -> threading.BoundedSemaphore:
+        host = urlparse(link).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(
+                    self.per_host_limit
+                )
+            return self._host_limits[host]
+
+    def get_output_path(self, link: str, output_dir: str) -> str:
+        if self.convert:
+            return get_output_path(link, output_dir, self.output_format)
+        return os.path.join(output_dir, os.path.basename(link))
+
+    def _final_path(self, output_path: str) -> str | None:
+        """The output that stays on disk, or None when it is only kept raw"""
+        if self.final_output_path:
+            return self.final_output_path(output_path)
+        return output_path if self.convert else None
+
+    def _fetch(
+        self, link: str, output_path: str, headers: dict[str, str]
+    ) -> tuple[str | None, str]:
+        with self._host_limit(link):
+            with self.session.get(
+                link, stream=True, timeout=self.timeout, headers=headers
+            ) as response:
+                if response.status_code == 304:
+                    print(f"⏭️ Not modified, skipping: {link}")
+                    return output_path, "skipped"
+                if response.status_code != 200:
+                    print(
+                        f"❌ Failed to download {link}. "
+                        f"Status code: {response.status_code}"
+                    )
+                    return None, "failed"
+
+                hasher = hashlib.sha256()
+                if self.convert:
+                    convert_response(
+                        response,
+                        output_path,
+                        self.output_format,
+                        hasher,
+                        compression=self.compression,
+                    )
+                else:
+                    save_response(response, output_path, hasher)
+
+                if self.manifest:
+                    self.manifest.record(
+                        link,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                        content_hash=hasher.hexdigest(),
+                        output_path=self._final_path(output_path) or output_path,
+                    )
+                return output_path, "downloaded"
+
+    def _download(self, link: str, output_dir: str) -> tuple[str | None, str]:
+        output_path = self.get_output_path(link, output_dir)
+        final_path = self._final_path(output_path)
+        headers = {}
+        if self.manifest:
+            headers = self.manifest.conditional_headers(
+                link, final_path or output_path
+            )
+        if final_path and not headers and os.path.exists(final_path):
+            print(f"✅ Output already exists: {final_path}")
+            return output_path, "skipped"
+
+        for attempt in range(self.retries + 1):
+            try:
+                output_path, status = self._fetch(link, output_path, headers)
+                break
+            except requests.exceptions.RequestException as e:
+                if attempt == self.retries:
+                    print(f"❌ Giving up on {link}: {e}")
+                    return None, "failed"
+                delay = self.backoff_factor * (2**attempt)
+                print(f"⚠️ Error downloading {link}: {e}. Retrying in {delay}s...")
+                time.sleep(delay)
+
+        # Outside the try: a failing callback is not a download error to retry
+        if status == "downloaded" and self.on_downloaded:
+            self.on_downloaded(output_path)
+        return output_path, status
+
+    def download(self, link: str, output_dir: str) -> str | None:
+        """Download a single file, retrying transfers that break mid-stream"""
+        output_path, _ = self._download(link, output_dir)
+        return output_path
+
+    def download_all(self, links: list[str], output_dir: str) -> dict:
+        """
+        Download all links concurrently.
+
+        Returns the same ``successful_downloads`` / ``failed_downloads``
+        counts as ``crawl_category``, plus the number of unchanged files
+        that were skipped, the output files, the failed links and the elapsed
+        time.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        started = time.monotonic()
+        files = []
+        failed_links = []
+        skipped = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._download, link, output_dir): link
+                for link in links
+            }
+            for future in as_completed(futures):
+                link = futures[future]
+                try:
+                    output_path, status = future.result()
+                except Exception as e:
+                    print(f"❌ Error processing {link}: {e}")
+                    output_path, status = None, "failed"
+
+                if status == "failed":
+                    failed_links.append(link)
+                elif status == "skipped":
+                    skipped += 1
+                else:
+                    files.append(output_path)
+
+        elapsed = time.monotonic() - started
+        print(
+            f"Downloaded {len(files)}/{len(links)} files "
+            f"in {elapsed:.1f}s ({skipped} unchanged, {len(failed_links)} failed)"
+        )
+        return {
+            "successful_downloads": len(files),
+            "failed_downloads": len(failed_links),
+            "skipped_downloads": skipped,
+            "output_dir": output_dir,
+            "files": files,
+            "failed_links": failed_links,
+            "elapsed_seconds": elapsed,
+        }
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
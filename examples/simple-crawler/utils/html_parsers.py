@@ -0,0 +1,114 @@
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Fastest first
+PARSER_BACKENDS = ("selectolax", "lxml", "strainer", "html.parser")
+
+
+def has_class(class_name):
+    """
+    SoupStrainer attribute matcher for one class of a multi-class attribute.
+    A plain ``class_="..."`` strainer only matches the full attribute value.
+    """
+
+    def match(value):
+        if value is None:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return class_name in classes
+
+    return match
+
+
+def available_backends():
+    """Parser backends whose libraries are installed"""
+    backends = []
+    for backend in PARSER_BACKENDS:
+        if backend == "selectolax" and LexborHTMLParser is None:
+            continue
+        if backend == "lxml" and lxml is None:
+            continue
+        backends.append(backend)
+    return backends
+
+
+def default_backend():
+    return available_backends()[0]
+
+
+def _extract_html_parser(html, tag, class_name, attr):
+    soup = BeautifulSoup(html, "html.parser")
+    elements = soup.find_all(tag, class_=class_name)
+    return [el[attr] for el in elements if el.has_attr(attr)]
+
+
+def _extract_strainer(html, tag, class_name, attr):
+    # Only the matching elements are turned into a tree
+    only_matches = SoupStrainer(tag, class_=has_class(class_name))
+    builder = "lxml" if lxml is not None else "html.parser"
+    soup = BeautifulSoup(html, builder, parse_only=only_matches)
+    return [el[attr] for el in soup.find_all(tag) if el.has_attr(attr)]
+
+
+def _extract_lxml(html, tag, class_name, attr):
+    if not html.strip():
+        return []
+    tree = lxml.html.fromstring(html)
+    xpath = (
+        f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), "
+        f"' {class_name} ')]/@{attr}"
+    )
+    return [str(value) for value in tree.xpath(xpath)]
+
+
+def _extract_selectolax(html, tag, class_name, attr):
+    tree = LexborHTMLParser(html)
+    values = (node.attributes.get(attr) for node in tree.css(f"{tag}.{class_name}"))
+    return [value for value in values if value is not None]
+
+
+_EXTRACTORS = {
+    "html.parser": _extract_html_parser,
+    "strainer": _extract_strainer,
+    "lxml": _extract_lxml,
+    "selectolax": _extract_selectolax,
+}
+
+
+def extract_attribute(html, tag, class_name, attr, backend=None):
+    """
+    Return ``attr`` of every ``<tag class="class_name">`` element in ``html``.
+
+    ``backend`` is one of ``PARSER_BACKENDS``:
+
+    - ``html.parser``: full BeautifulSoup tree (pure Python, slowest)
+    - ``strainer``: BeautifulSoup restricted to the matching elements
+    - ``lxml``: lxml's C parser and an XPath query
+    - ``selectolax``: selectolax's lexbor parser and a CSS query
+
+    Defaults to the fastest installed backend. A backend whose library is
+    missing falls back to the default one.
+    """
+    if backend is None:
+        backend = default_backend()
+    elif backend not in _EXTRACTORS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    elif backend not in available_backends():
+        fallback = default_backend()
+        print(f"Parser backend {backend} is not installed, using {fallback}")
+        backend = fallback
+    return _EXTRACTORS[backend](html, tag, class_name, attr)
+
+
+def extract_links(html, backend=None):
+    """Return the href of every ``a.downloadBtn`` link in ``html``"""
+    return extract_attribute(html, "a", "downloadBtn", "href", backend)
@@ -0,0 +1,128 @@
+import os
+import re
+import threading
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from .html_parsers import extract_links
+
+
+def matches_filters(link, branch=None, category=None):
+    """
+    Check a price file link against branch/category filters using its name,
+    e.g. ``PriceFull7290055700007-0084-202510180300.gz``.
+    """
+    filename = os.path.basename(link)
+    if category and not re.match(rf"{re.escape(category)}\d", filename, re.I):
+        return False
+    if branch:
+        parts = filename.split("-")
+        if len(parts) < 2 or parts[1].lstrip("0") != branch.lstrip("0"):
+            return False
+    return True
+
+
+class HttpPortalBackend:
+    """
+    Collect price file links from the portal over plain HTTP, without a browser.
+
+    By default the portal page is fetched once and every ``a.downloadBtn``
+    link on it is filtered by branch and category using the file name. If the
+    portal exposes a server-side list endpoint, pass it as ``list_url`` with
+    ``{branch}``, ``{category}`` and ``{page}`` placeholders and it is
+    requested page by page instead, mirroring ``changePage(n)``. Links are
+    extracted with the fastest installed parser (see ``html_parsers``) unless
+    ``parser`` names one.
+
+    ``max_pages`` applies on both paths. Without ``list_url`` the portal page
+    stands in for page 1; if it already holds the whole table, pass the
+    portal's ``page_size`` and its filtered links are split into pages of
+    that many rows, keeping only the first ``max_pages``.
+
+    An empty result means the links are only rendered by JavaScript, and the
+    caller should fall back to Selenium.
+    """
+
+    def __init__(
+        self,
+        url,
+        download_base_url,
+        list_url=None,
+        session=None,
+        timeout=30,
+        parser=None,
+        page_size=None,
+    ):
+        self.url = url
+        self.download_base_url = download_base_url
+        self.list_url = list_url
+        self.timeout = timeout
+        self.parser = parser
+        self.page_size = page_size
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "Mozilla/5.0")
+        self._portal_html = None
+        self._lock = threading.Lock()
+
+    def fetch(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def get_portal_html(self):
+        """Fetch the portal page once and share it between all lookups"""
+        with self._lock:
+            if self._portal_html is None:
+                self._portal_html = self.fetch(self.url)
+            return self._portal_html
+
+    def extract_links(self, html):
+        hrefs = extract_links(html, backend=self.parser)
+        return [urljoin(self.download_base_url, href) for href in hrefs]
+
+    def get_branches(self):
+        """Return ``{value: name}`` for every branch in the branch filter"""
+        only_filter = SoupStrainer("select", id="branch_filter")
+        soup = BeautifulSoup(
+            self.get_portal_html(), "html.parser", parse_only=only_filter
+        )
+        return {
+            option["value"]: option.get_text(strip=True)
+            for option in soup.find_all("option")
+            if option.get("value")
+        }
+
+    def get_links(self, branch=None, category=None, max_pages=1):
+        """Return the download links for a branch and category"""
+        links, _ = self.get_links_and_pages(branch, category, max_pages)
+        return links
+
+    def get_links_and_pages(self, branch=None, category=None, max_pages=1):
+        """
+        Return ``(links, pages)``: the download links for a branch and
+        category, and how many list pages actually had new links.
+        """
+        if not self.list_url:
+            links = self.extract_links(self.get_portal_html())
+            links = [link for link in links if matches_filters(link, branch, category)]
+            page_size = self.page_size or len(links) or 1
+            pages = min(-(-len(links) // page_size), max_pages)
+            return links[: pages * page_size], pages
+
+        links = []
+        seen = set()
+        pages = 0
+        for page in range(1, max_pages + 1):
+            page_url = self.list_url.format(
+                branch=branch or "", category=category or "", page=page
+            )
+            page_links = self.extract_links(self.fetch(page_url))
+            new_links = [link for link in page_links if link not in seen]
+            if not new_links:
+                break
+            seen.update(new_links)
+            links.extend(new_links)
+            pages += 1
+        return links, pages
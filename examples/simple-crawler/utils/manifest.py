@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MANIFEST_PATH = os.path.join("prices", "manifest.sqlite3")
+
+
+class CrawlManifest:
+    """
+    Persistent record of every fetched price file, keyed by URL.
+
+    Stores the ETag, Last-Modified, content hash and output path of the last
+    successful download, so the next crawl can send a conditional request and
+    skip files the server reports as unchanged. Backed by SQLite and safe to
+    share between downloader threads.
+    """
+
+    def __init__(self, path: str = DEFAULT_MANIFEST_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS files (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                content_hash TEXT,
+                output_path TEXT,
+                fetched_at REAL
+            )
+            """
+        )
+
+    def get(self, url: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM files WHERE url = ?", (url,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def conditional_headers(self, url: str, output_path: str) -> dict[str, str]:
+        """
+        Build If-None-Match / If-Modified-Since headers for ``url``.
+        Returns no headers if the previous output is gone from disk or was
+        written somewhere else than ``output_path`` (another output directory
+        or format), since a 304 would then leave nothing at ``output_path``.
+        """
+        entry = self.get(url)
+        if not entry or not entry["output_path"]:
+            return {}
+        if os.path.abspath(entry["output_path"]) != os.path.abspath(output_path):
+            return {}
+        if not os.path.exists(output_path):
+            return {}
+
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(
+        self,
+        url: str,
+        etag: str | None,
+        last_modified: str | None,
+        content_hash: str | None,
+        output_path: str,
+    ):
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO files
+                    (url, etag, last_modified, content_hash, output_path,
+                     fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    output_path = excluded.output_path,
+                    fetched_at = excluded.fetched_at
+                """,
+                (url, etag, last_modified, content_hash, output_path, time.time()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
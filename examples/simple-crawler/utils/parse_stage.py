@@ -0,0 +1,212 @@
+"""
+Multi-process parse stage for downloaded price files.
+
+Run it on its own to reprocess a backlog of downloaded files:
+
+    python -m utils.parse_stage prices/<branch> [--format ndjson] [--workers 8]
+        [--keep-raw]
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .xml_stream import (
+    OUTPUT_EXTENSIONS,
+    iter_file_chunks,
+    iter_gunzip,
+    iter_xml_records,
+    write_records,
+)
+
+# Leftovers that are never price files
+_SKIP_SUFFIXES = tuple(OUTPUT_EXTENSIONS.values()) + (".json", ".part", ".sqlite3")
+
+
+def _remove_raw(path):
+    if path.endswith(".gz"):
+        os.remove(path)
+
+
+def parsed_output_path(path, output_format="ndjson"):
+    """Where ``parse_file`` writes the output for a downloaded file"""
+    xml_path = path[:-3] if path.endswith(".gz") else path
+    return xml_path + OUTPUT_EXTENSIONS[output_format]
+
+
+def parse_file(path, output_format="ndjson", compression=None, keep_raw=False):
+    """
+    Convert one downloaded price file (.gz or plain XML) and report timing.
+    Runs in a worker process, so it only takes and returns plain values.
+    Unless ``keep_raw`` is set, a .gz file is deleted once its output exists.
+    """
+    output_path = parsed_output_path(path, output_format)
+    size = os.path.getsize(path)
+    if os.path.exists(output_path):
+        if not keep_raw:
+            _remove_raw(path)
+        return {"path": path, "output_path": output_path, "skipped": True}
+
+    started = time.perf_counter()
+    records = iter_xml_records(iter_gunzip(iter_file_chunks(path)))
+    count = write_records(records, output_path, output_format, compression)
+    elapsed = time.perf_counter() - started
+    if not keep_raw:
+        _remove_raw(path)
+    return {
+        "path": path,
+        "output_path": output_path,
+        "skipped": False,
+        "records": count,
+        "bytes": size,
+        "seconds": elapsed,
+        "bytes_per_second": size / elapsed if elapsed else 0.0,
+    }
+
+
+def find_price_files(directory):
+    """Downloaded price files (.gz / XML) under ``directory``"""
+    paths = []
+    for root, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            if filename.endswith(_SKIP_SUFFIXES) or "sqlite3" in filename:
+                continue
+            paths.append(os.path.join(root, filename))
+    return paths
+
+
+class ParseStage:
+    """
+    Parse downloaded files on a ``ProcessPoolExecutor`` while the network
+    keeps going.
+
+    ``submit()`` hands a file to the pool and blocks once ``max_pending``
+    files are queued or being parsed, so a slow parse applies backpressure
+    to the downloader instead of piling up. Pass ``submit`` as the
+    downloader's ``on_downloaded`` callback to chain the two stages.
+
+    Raw .gz files are deleted once parsed, unless ``keep_raw`` is set. Pass
+    ``output_path`` as the downloader's ``final_output_path`` so the crawl
+    manifest tracks the parsed file instead, and a later crawl still sends
+    conditional requests for it.
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        max_pending=None,
+        output_format="ndjson",
+        compression=None,
+        keep_raw=False,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.output_format = output_format
+        self.compression = compression
+        self.keep_raw = keep_raw
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * self.max_workers)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.results = []
+        self.failed = []
+
+    def output_path(self, path):
+        return parsed_output_path(path, self.output_format)
+
+    def submit(self, path):
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(
+                parse_file, path, self.output_format, self.compression, self.keep_raw
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._done(path, f))
+
+    def _done(self, path, future):
+        self._slots.release()
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"❌ Error parsing {path}: {e}")
+            with self._lock:
+                self.failed.append(path)
+            return
+
+        if result["skipped"]:
+            print(f"✅ Output already exists: {result['output_path']}")
+        else:
+            print(
+                f"✅ Parsed {result['records']} records from {path} in "
+                f"{result['seconds']:.2f}s "
+                f"({result['bytes_per_second'] / 1024 / 1024:.1f} MB/s)"
+            )
+        with self._lock:
+            self.results.append(result)
+
+    def close(self):
+        """Wait for every queued file and return a summary"""
+        self._executor.shutdown(wait=True)
+        elapsed = time.monotonic() - self._started
+        parsed = [r for r in self.results if not r["skipped"]]
+        total_bytes = sum(r["bytes"] for r in parsed)
+        summary = {
+            "parsed_files": len(parsed),
+            "skipped_files": len(self.results) - len(parsed),
+            "failed_files": len(self.failed),
+            "records": sum(r["records"] for r in parsed),
+            "bytes": total_bytes,
+            "elapsed_seconds": elapsed,
+            "bytes_per_second": total_bytes / elapsed if elapsed else 0.0,
+        }
+        print(
+            f"Parse stage: {summary['parsed_files']} parsed, "
+            f"{summary['skipped_files']} skipped, {summary['failed_files']} failed, "
+            f"{total_bytes / 1024 / 1024:.1f} MB in {elapsed:.1f}s "
+            f"({summary['bytes_per_second'] / 1024 / 1024:.1f} MB/s)"
+        )
+        return summary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse downloaded price files")
+    parser.add_argument("directory", help="e.g. prices/<branch>")
+    parser.add_argument(
+        "--format", default="ndjson", choices=sorted(OUTPUT_EXTENSIONS)
+    )
+    parser.add_argument(
+        "--compression",
+        default=None,
+        help="parquet/arrow codec, e.g. zstd, lz4 or none "
+        "(default: zstd for parquet, none for arrow)",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--keep-raw", action="store_true", help="keep .gz files after parsing"
+    )
+    args = parser.parse_args()
+
+    paths = find_price_files(args.directory)
+    print(f"Parsing {len(paths)} files from {args.directory}...")
+    stage = ParseStage(
+        max_workers=args.workers,
+        output_format=args.format,
+        compression=args.compression,
+        keep_raw=args.keep_raw,
+    )
+    for path in paths:
+        stage.submit(path)
+    stage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import time
+
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.support.ui import WebDriverWait
+
+DOWNLOAD_LINK_SELECTOR = "a.downloadBtn"
+DEFAULT_TIMEOUT = 10
+# How long the reloaded list must stay unchanged before it counts as loaded
+SETTLE_SECONDS = 0.3
+
+# One round trip instead of one get_attribute() call per link
+_HREFS_SCRIPT = (
+    "return Array.from(document.querySelectorAll(arguments[0]))"
+    ".map(function (a) { return a.getAttribute('href'); });"
+)
+
+
+# The table row of the first link, or the first row of any table when the
+# list is empty (e.g. a "no files" row)
+_FIRST_ROW_SCRIPT = (
+    "var link = document.querySelector(arguments[0]);"
+    "return (link && (link.closest('tr') || link))"
+    " || document.querySelector('table tbody tr, table tr');"
+)
+
+
+def get_link_hrefs(driver, selector=DOWNLOAD_LINK_SELECTOR):
+    return driver.execute_script(_HREFS_SCRIPT, selector)
+
+
+def snapshot_links(driver, selector=DOWNLOAD_LINK_SELECTOR):
+    """
+    Remember the current download list before an action that reloads it.
+    Returns the first row of the list (or None) and the list of hrefs.
+    """
+    first_row = driver.execute_script(_FIRST_ROW_SCRIPT, selector)
+    return first_row, get_link_hrefs(driver, selector)
+
+
+def _is_stale(element):
+    try:
+        element.is_enabled()
+        return False
+    except StaleElementReferenceException:
+        return True
+
+
+def document_ready(driver):
+    """Expected condition: the page finished loading"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def links_updated(snapshot, selector=DOWNLOAD_LINK_SELECTOR, settle=SETTLE_SECONDS):
+    """
+    Expected condition: the download list was re-rendered.
+
+    The list counts as changed once the document finished loading and either
+    the old first row is detached from the DOM (the table was replaced, even
+    with identical links) or the set of hrefs changed. That alone also holds
+    while the table is cleared and the AJAX refill is still in flight, so the
+    condition is only true once the new list has rows (links or a "no files"
+    row) and its hrefs stayed the same for ``settle`` seconds.
+    """
+    old_first, old_hrefs = snapshot
+    changed = False
+    seen_hrefs = None
+    seen_since = None
+
+    def condition(driver):
+        nonlocal changed, seen_hrefs, seen_since
+        if not document_ready(driver):
+            return False
+        if not changed:
+            stale = old_first is not None and _is_stale(old_first)
+            changed = stale or get_link_hrefs(driver, selector) != old_hrefs
+            if not changed:
+                return False
+
+        first_row, hrefs = snapshot_links(driver, selector)
+        now = time.monotonic()
+        if first_row is None or hrefs != seen_hrefs:
+            seen_hrefs = None if first_row is None else hrefs
+            seen_since = now
+            return False
+        return now - seen_since >= settle
+
+    return condition
+
+
+def timed_wait(driver, condition, label, timeout=DEFAULT_TIMEOUT):
+    """
+    Wait for ``condition`` and return how long the wait actually took.
+    A timeout is reported but not raised, so the crawl carries on as it did
+    with a fixed sleep.
+    """
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+        elapsed = time.monotonic() - started
+        print(f"⏱️ {label}: ready after {elapsed:.2f}s")
+    except TimeoutException:
+        elapsed = time.monotonic() - started
+        print(f"⏱️ {label}: not ready after {elapsed:.2f}s, continuing")
+    return elapsed
+
+
+def wait_for_links_update(driver, snapshot, label, timeout=DEFAULT_TIMEOUT):
+    """Wait until the download list reloads after a filter or page change"""
+    return timed_wait(driver, links_updated(snapshot), label, timeout)
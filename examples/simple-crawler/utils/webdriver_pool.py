@@ -0,0 +1,116 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium.common.exceptions import WebDriverException
+
+
+class WebDriverPool:
+    """
+    Bounded pool of reusable WebDriver instances.
+
+    Drivers are started lazily by ``factory`` up to ``size`` and warmed up
+    once with ``warm_up`` (e.g. loading the portal). After that they are
+    handed out again and again by ``acquire()``, which blocks while every
+    driver is busy. A driver whose browser session died is dropped and
+    replaced on the next ``acquire()``.
+    """
+
+    def __init__(self, factory, size: int, warm_up=None):
+        self.size = size
+        self._factory = factory
+        self._warm_up = warm_up
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _start_driver(self):
+        driver = self._factory()
+        if self._warm_up:
+            try:
+                self._warm_up(driver)
+            except Exception:
+                driver.quit()
+                raise
+        return driver
+
+    def _checkout(self):
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_start = len(self._drivers) < self.size
+                if can_start:
+                    # Reserve the slot before the (slow) browser start-up
+                    self._drivers.append(None)
+
+            if can_start:
+                break
+            try:
+                # Wake up now and then in case a dead driver freed a slot
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+        try:
+            driver = self._start_driver()
+        except Exception:
+            with self._lock:
+                self._drivers.remove(None)
+            raise
+        with self._lock:
+            self._drivers[self._drivers.index(None)] = driver
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a driver for the duration of the ``with`` block"""
+        driver = self._checkout()
+        try:
+            yield driver
+        except Exception:
+            if not self._is_alive(driver):
+                print("WebDriver session died, replacing it...")
+                self._discard(driver)
+                driver = None
+            raise
+        finally:
+            if driver is not None:
+                self._idle.put(driver)
+
+    def close(self):
+        """Quit every driver in the pool"""
+        with self._lock:
+            drivers = [driver for driver in self._drivers if driver is not None]
+            self._drivers = []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        print(f"Closed {len(drivers)} Chrome drivers.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
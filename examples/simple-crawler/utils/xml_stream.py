@@ -0,0 +1,207 @@
+import json
+import os
+import zlib
+import xml.etree.ElementTree as ET
+
+from .columnar import COLUMNAR_FORMATS, write_price_table
+
+# Repeating record elements in PriceFull / PromoFull files, matched
+# case-insensitively (chains disagree on casing, e.g. ``<Item>`` / ``<ITEM>``)
+RECORD_TAGS = ("Item", "Promotion")
+CHUNK_SIZE = 64 * 1024
+# The streamed JSON array is a list of records, not the nested document
+# ``convert_xml_to_json`` writes to ``.json``, so it gets its own suffix
+OUTPUT_EXTENSIONS = {
+    "ndjson": ".ndjson",
+    "json": ".records.json",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def elem_to_dict(elem):
+    """Convert an XML element (and its children) to a nested dict"""
+    result = {elem.tag: {} if elem.attrib else None}
+    children = list(elem)
+    if children:
+        dd = {}
+        for dc in map(elem_to_dict, children):
+            for k, v in dc.items():
+                if k in dd:
+                    if not isinstance(dd[k], list):
+                        dd[k] = [dd[k]]
+                    dd[k].append(v)
+                else:
+                    dd[k] = v
+        result = {elem.tag: dd}
+    if elem.attrib:
+        result[elem.tag].update(("@" + k, v) for k, v in elem.attrib.items())
+    if elem.text and elem.text.strip():
+        text = elem.text.strip()
+        if children or elem.attrib:
+            result[elem.tag]["#text"] = text
+        else:
+            result[elem.tag] = text
+    return result
+
+
+def iter_file_chunks(path, chunk_size=CHUNK_SIZE):
+    """Read a file as a stream of byte chunks"""
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def iter_gunzip(chunks):
+    """
+    Incrementally decompress a stream of gzip byte chunks.
+
+    Input that does not start with the gzip magic bytes is passed through
+    unchanged, so plain XML downloads go through the same pipeline.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, b"")
+    if not first.startswith(GZIP_MAGIC):
+        if first:
+            yield first
+        yield from chunks
+        return
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = first
+    while True:
+        while pending:
+            data = decompressor.decompress(pending)
+            if data:
+                yield data
+            # Concatenated gzip members: start over on the leftover bytes
+            pending = decompressor.unused_data
+            if pending:
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        pending = next(chunks, None)
+        if pending is None:
+            break
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def iter_xml_records(chunks, record_tags=RECORD_TAGS):
+    """
+    Incrementally parse XML bytes and yield records as soon as they close.
+
+    Every record element (``<Item>``, ``<Promotion>``) is yielded as
+    ``elem_to_dict(elem)`` and then detached from the tree, so memory stays
+    flat regardless of file size. Leaf elements outside of a record
+    (``ChainId``, ``StoreId``, ...) are yielded the same way, which keeps the
+    file header available to consumers. ``record_tags`` are matched
+    case-insensitively.
+    """
+    record_tags = {tag.lower() for tag in record_tags}
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elems = []
+    had_children = []
+    in_record = 0
+
+    def drain():
+        nonlocal in_record
+        for event, elem in parser.read_events():
+            if event == "start":
+                if had_children:
+                    had_children[-1] = True
+                open_elems.append(elem)
+                had_children.append(False)
+                if elem.tag.lower() in record_tags:
+                    in_record += 1
+                continue
+
+            open_elems.pop()
+            is_container = had_children.pop()
+            parent = open_elems[-1] if open_elems else None
+            if elem.tag.lower() in record_tags:
+                in_record -= 1
+                if in_record:
+                    continue
+            elif in_record or parent is None or is_container:
+                continue
+
+            yield elem_to_dict(elem)
+            # Drop the finished element so the tree never grows
+            elem.clear()
+            parent.remove(elem)
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def write_records(records, output_path, output_format="ndjson", compression=None):
+    """
+    Write records to ``output_path`` one at a time and return their count.
+
+    ``ndjson`` writes one JSON document per line, ``json`` writes a single
+    JSON array, ``parquet`` and ``arrow`` write typed price items compressed
+    with ``compression`` (see ``columnar.write_price_table``; ignored for
+    JSON). The file is written under a temporary name and renamed once
+    complete, so a partial output is never mistaken for a finished one.
+    """
+    if output_format not in OUTPUT_EXTENSIONS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    if output_format in COLUMNAR_FORMATS:
+        return write_price_table(
+            records, output_path, output_format, compression=compression
+        )
+
+    tmp_path = output_path + ".part"
+    count = 0
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            if output_format == "json":
+                f.write("[\n")
+            for record in records:
+                line = json.dumps(record, ensure_ascii=False)
+                if output_format == "json" and count:
+                    f.write(",\n")
+                f.write(line)
+                if output_format == "ndjson":
+                    f.write("\n")
+                count += 1
+            if output_format == "json":
+                f.write("\n]\n")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, output_path)
+    return count
+
+
+def stream_xml_to_json(
+    xml_file_path: str,
+    output_format="ndjson",
+    record_tags=RECORD_TAGS,
+    compression=None,
+):
+    """
+    Streaming variant of ``convert_xml_to_json`` for large price files.
+    Skips conversion if the output file already exists.
+    """
+    if output_format not in OUTPUT_EXTENSIONS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    output_path = xml_file_path + OUTPUT_EXTENSIONS[output_format]
+    if os.path.exists(output_path):
+        print(f"✅ Output already exists: {output_path}")
+        return output_path
+
+    records = iter_xml_records(iter_file_chunks(xml_file_path), record_tags)
+    count = write_records(records, output_path, output_format, compression)
+
+    print(f"✅ Streamed {count} records to {output_format}: {output_path}")
+    return output_path
@@ -1,23 +1,45 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import JSONResponse
-from rag.chain import qa_chain
+from rag.answer_cache import answer_cache
+from rag.chain import qa_chain_loader
 
 router = APIRouter()
 
 
 @router.get("/health")
 def health():
+    # Liveness: answers while the chain is still being built
     print("healthy")
-    return {"message": "all good"}
+    return {
+        "message": "all good",
+        "chain": qa_chain_loader.status(),
+        "answer_cache": answer_cache.stats(),
+    }
+
+
+@router.get("/ready")
+def ready():
+    # Readiness: 503 until the chain can answer questions
+    status = qa_chain_loader.status()
+    if status["state"] != "ready":
+        return JSONResponse(status, status_code=503)
+    return status
+
+
+async def answer(q):
+    try:
+        qa_chain = await qa_chain_loader.get()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"QA chain is not available: {e}")
+    # Async all the way down: no threadpool worker is held during the LLM call
+    response = await qa_chain.ainvoke(q)
+    return {
+        "answer": response["result"],
+        "sources": [doc.page_content for doc in response["source_documents"]],
+    }
 
 
 @router.get("/ask")
-def ask(q: str = Query(..., description="question to ask")):
-    response = qa_chain.invoke(q)
-    sources = [doc.page_content for doc in response["source_documents"]]
-    return JSONResponse(
-        {
-            "answer": response["result"],
-            "sources": sources,
-        }
-    )
+async def ask(q: str = Query(..., description="question to ask")):
+    result, cache = await answer_cache.get_or_compute(q, lambda: answer(q))
+    return JSONResponse({**result, "cache": cache})
@@ -1,5 +1,19 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from api.routes import router
+from rag.chain import qa_chain_loader
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the chain in the background; /health answers right away
+    qa_chain_loader.start()
+    try:
+        yield
+    finally:
+        await qa_chain_loader.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(router)
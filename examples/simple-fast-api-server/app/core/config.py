@@ -4,3 +4,18 @@ from dotenv import load_dotenv
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# "openai", or "hashing" for a local deterministic embedder (offline/tests)
+EMBEDDINGS_BACKEND = os.getenv(
+    "EMBEDDINGS_BACKEND", "openai" if OPENAI_API_KEY else "hashing"
+)
+EMBEDDINGS_MODEL = os.getenv("EMBEDDINGS_MODEL", "text-embedding-3-small")
+
+# Embedding cache and the saved FAISS index
+RAG_CACHE_DIR = os.getenv("RAG_CACHE_DIR", ".rag_cache")
+
+# Semantic answer cache for /ask. The similarity threshold depends on the
+# embedder: OpenAI embeddings of paraphrases score higher than hashed ones.
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "1000"))
@@ -2,4 +2,6 @@ import os
 from core.config import OPENAI_API_KEY
 
 
-os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
+# Unset without a .env; os.environ only takes strings
+if OPENAI_API_KEY:
+    os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
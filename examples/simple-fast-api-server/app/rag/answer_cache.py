@@ -0,0 +1,165 @@
+import asyncio
+import re
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from core.config import ANSWER_CACHE_SIZE, ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTL
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_question(question):
+    """``"Cheapest milk?"`` and ``"cheapest  MILK"`` are the same question"""
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", question.lower())).strip()
+
+
+class SemanticAnswerCache:
+    """
+    Answers to previous questions, found by the exact normalized question or,
+    failing that, by the nearest cached question whose embedding has cosine
+    similarity of at least ``threshold``.
+
+    Entries expire after ``ttl`` seconds and the least recently used go first
+    beyond ``max_entries``. Concurrent misses on the same question share one
+    computation.
+    """
+
+    def __init__(self, embedder=None, threshold=None, max_entries=None, ttl=None):
+        self._embedder = embedder
+        self.threshold = ANSWER_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = ANSWER_CACHE_SIZE if max_entries is None else max_entries
+        self.ttl = ANSWER_CACHE_TTL if ttl is None else ttl
+        # normalized question -> (expires_at, unit vector, answer)
+        self._entries = OrderedDict()
+        self._matrix = None
+        self._matrix_keys = []
+        self._inflight = {}
+        self.hits = {"exact": 0, "semantic": 0}
+        self.misses = 0
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            from rag.embeddings import get_embedding_backend
+
+            self._embedder, _ = get_embedding_backend()
+        return self._embedder
+
+    async def _embed(self, question):
+        embedding = await self.embedder.aembed_query(question)
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _expire(self):
+        now = time.monotonic()
+        expired = [
+            key
+            for key, (expires_at, _, _) in self._entries.items()
+            if expires_at < now
+        ]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._matrix = None
+
+    def _nearest(self, vector):
+        if not self._entries:
+            return None, 0.0
+        if self._matrix is None:
+            self._matrix_keys = [
+                key for key, entry in self._entries.items() if entry[1] is not None
+            ]
+            if not self._matrix_keys:
+                return None, 0.0
+            self._matrix = np.stack(
+                [self._entries[key][1] for key in self._matrix_keys]
+            )
+        if not self._matrix_keys:
+            return None, 0.0
+        similarities = self._matrix @ vector
+        best = int(np.argmax(similarities))
+        return self._matrix_keys[best], float(similarities[best])
+
+    def _hit(self, key, match, similarity):
+        self._entries.move_to_end(key)
+        self.hits[match] += 1
+        info = {"match": match, "similarity": round(similarity, 4), "question": key}
+        return self._entries[key][2], info
+
+    async def lookup(self, question):
+        """``(answer, info)`` for a cached answer, else ``(None, vector)``"""
+        self._expire()
+        key = normalize_question(question)
+        if key in self._entries:
+            return self._hit(key, "exact", 1.0)
+
+        try:
+            vector = await self._embed(key)
+        except Exception as e:
+            # Embedding backend down: exact matches only for this question
+            print(f"Answer cache embedding failed: {e}")
+            return None, None
+        nearest, similarity = self._nearest(vector)
+        if nearest is not None and similarity >= self.threshold:
+            return self._hit(nearest, "semantic", similarity)
+        return None, vector
+
+    def store(self, question, vector, answer):
+        key = normalize_question(question)
+        self._entries[key] = (time.monotonic() + self.ttl, vector, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._matrix = None
+
+    async def _compute_and_store(self, key, question, vector, compute):
+        try:
+            answer = await compute()
+        finally:
+            del self._inflight[key]
+        self.store(question, vector, answer)
+        return answer
+
+    async def get_or_compute(self, question, compute):
+        """
+        The cached answer for ``question``, or ``await compute()`` stored for
+        next time. Returns ``(answer, info)``; ``info`` is None on a miss.
+
+        The computation runs in its own task, so a requester that goes away
+        (e.g. the client disconnected) doesn't cancel it for the others
+        waiting on the same question.
+        """
+        answer, info = await self.lookup(question)
+        if answer is not None:
+            return answer, info
+
+        vector = info
+        key = normalize_question(question)
+        task = self._inflight.get(key)
+        if task is not None:
+            return await asyncio.shield(task), {"match": "inflight"}
+
+        self.misses += 1
+        task = asyncio.create_task(
+            self._compute_and_store(key, question, vector, compute)
+        )
+        self._inflight[key] = task
+        # Everyone may have left; don't warn about an unretrieved error then
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return await asyncio.shield(task), None
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": dict(self.hits),
+            "misses": self.misses,
+        }
+
+
+answer_cache = SemanticAnswerCache()
@@ -1,14 +1,38 @@
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import FAISS
-from langchain.chains import RetrievalQA
-from rag.documents import load_documents
+import asyncio
+import threading
+import time
 
+# LangChain, OpenAI and FAISS are imported inside the build below, so
+# importing this module (and starting the server) stays fast.
+
+
+class BuildStopped(Exception):
+    """The chain build was asked to stop between two of its stages"""
+
+
+def _check_stop(stop_event):
+    if stop_event is not None and stop_event.is_set():
+        raise BuildStopped("QA chain build stopped")
+
+
+def get_retriever(stop_event=None):
+    from rag.documents import load_documents
+    from rag.embeddings import get_embeddings
+    from rag.index import load_or_build_vectorstore
 
-def get_qa_chain():
     docs = load_documents()
-    embeddings = OpenAIEmbeddings()
-    vectorstore = FAISS.from_documents(docs, embeddings)
-    retriever = vectorstore.as_retriever(search_kwargs={"k": 2})
+    _check_stop(stop_event)
+    # Cached on disk: a restart with unchanged documents embeds nothing
+    vectorstore = load_or_build_vectorstore(docs, get_embeddings())
+    _check_stop(stop_event)
+    return vectorstore.as_retriever(search_kwargs={"k": 2})
+
+
+def get_qa_chain(stop_event=None):
+    from langchain_openai import ChatOpenAI
+    from langchain.chains import RetrievalQA
+
+    retriever = get_retriever(stop_event)
     return RetrievalQA.from_chain_type(
         llm=ChatOpenAI(model="gpt-4"),
         retriever=retriever,
@@ -16,4 +40,75 @@ def get_qa_chain():
     )
 
 
-qa_chain = get_qa_chain()
+class QAChainLoader:
+    """
+    Builds the QA chain once, in a background thread, after the server is up.
+
+    ``start()`` kicks the build off from the app's startup, ``get()`` waits
+    for that same build, and ``status()`` reports its state for the health
+    checks. A failed build is retried by the next ``get()``.
+
+    ``stop()`` at shutdown cannot interrupt the build thread mid-stage: it
+    asks the build to stop and waits for the current stage (loading the
+    documents, or loading or embedding the index) to finish, after which the
+    build gives up instead of starting the next one.
+    """
+
+    def __init__(self):
+        self.state = "pending"
+        self.error = None
+        self.build_seconds = None
+        self._task = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self._task is None or self.state == "failed":
+            self.state = "building"
+            self.error = None
+            self._stop_event.clear()
+            self._task = asyncio.get_running_loop().create_task(self._build())
+        return self._task
+
+    async def _build(self):
+        started = time.perf_counter()
+        try:
+            chain = await asyncio.to_thread(get_qa_chain, self._stop_event)
+        except BuildStopped:
+            self.state = "cancelled"
+            print("QA chain build stopped")
+            raise
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)
+            print(f"QA chain build failed: {e}")
+            raise
+        self.build_seconds = time.perf_counter() - started
+        self.state = "ready"
+        print(f"QA chain ready in {self.build_seconds:.2f}s")
+        return chain
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._stop_event.set()
+        # Not cancelled: that would stop waiting but leave the thread running
+        try:
+            await task
+        except Exception:
+            pass
+
+    async def get(self):
+        # shield: a cancelled request must not cancel the shared build
+        return await asyncio.shield(self.start())
+
+    def status(self):
+        status = {"state": self.state}
+        if self.build_seconds is not None:
+            status["build_seconds"] = round(self.build_seconds, 3)
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+qa_chain_loader = QAChainLoader()
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from core.config import EMBEDDINGS_BACKEND, EMBEDDINGS_MODEL, RAG_CACHE_DIR
+
+HASHING_DIMENSIONS = 384
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Local, deterministic embedder: hashed word and bigram counts, L2-normalized.
+    No network and no model download, so tests and offline runs always get
+    the same vectors.
+    """
+
+    def __init__(self, dimensions=HASHING_DIMENSIONS):
+        self.dimensions = dimensions
+        self.model_id = f"hashing-{dimensions}"
+
+    def _features(self, text):
+        words = _TOKEN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _embed(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wraps an embedding backend with an on-disk cache keyed by a hash of the
+    model and the text, so unchanged documents are never embedded twice.
+
+    The cache is two files in ``cache_dir``: ``keys.json`` and a float32
+    ``vectors.npy`` that is memory-mapped on load.
+    """
+
+    def __init__(self, backend, model_id, cache_dir):
+        self.backend = backend
+        self.model_id = model_id
+        self.cache_dir = cache_dir
+        self.keys_path = os.path.join(cache_dir, "keys.json")
+        self.vectors_path = os.path.join(cache_dir, "vectors.npy")
+        self._lock = threading.Lock()
+        self.backend_calls = 0
+        self._load()
+
+    def _load(self):
+        self._rows = {}
+        self._vectors = None
+        if os.path.exists(self.keys_path) and os.path.exists(self.vectors_path):
+            with open(self.keys_path, "r", encoding="utf-8") as f:
+                keys = json.load(f)
+            self._vectors = np.load(self.vectors_path, mmap_mode="r")
+            self._rows = {key: row for row, key in enumerate(keys)}
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def _save(self, new_keys, new_vectors):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        keys = [None] * len(self._rows)
+        for key, row in self._rows.items():
+            keys[row] = key
+        keys += new_keys
+        new_vectors = np.asarray(new_vectors, dtype=np.float32)
+        if self._vectors is None:
+            vectors = new_vectors
+        else:
+            vectors = np.vstack([self._vectors, new_vectors])
+
+        # Write both files next to the originals and swap them in
+        np.save(self.vectors_path + ".part.npy", vectors)
+        with open(self.keys_path + ".part", "w", encoding="utf-8") as f:
+            json.dump(keys, f)
+        os.replace(self.vectors_path + ".part.npy", self.vectors_path)
+        os.replace(self.keys_path + ".part", self.keys_path)
+        self._load()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            keys = [self.key(text) for text in texts]
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in self._rows and key not in missing:
+                    missing[key] = text
+            if missing:
+                self.backend_calls += 1
+                vectors = self.backend.embed_documents(list(missing.values()))
+                print(f"Embedded {len(missing)} new documents with {self.model_id}")
+                self._save(list(missing), vectors)
+            return [self._vectors[self._rows[key]].tolist() for key in keys]
+
+    def embed_query(self, text):
+        # Queries are one-off; caching them would only grow the files
+        return self.backend.embed_query(text)
+
+
+def get_embedding_backend(backend=None, model=None):
+    """``(embeddings, model_id)`` for ``openai`` or the local ``hashing`` embedder"""
+    backend = backend or EMBEDDINGS_BACKEND
+    if backend == "hashing":
+        embeddings = HashingEmbeddings()
+        return embeddings, embeddings.model_id
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+
+        model = model or EMBEDDINGS_MODEL
+        return OpenAIEmbeddings(model=model), f"openai-{model}"
+    raise ValueError(f"Unknown embeddings backend: {backend}")
+
+
+def get_embeddings(backend=None, model=None, cache_dir=None):
+    embeddings, model_id = get_embedding_backend(backend, model)
+    cache_dir = os.path.join(cache_dir or RAG_CACHE_DIR, "embeddings", model_id)
+    return CachedEmbeddings(embeddings, model_id, cache_dir)
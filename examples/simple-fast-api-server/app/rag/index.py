@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from langchain_community.vectorstores import FAISS
+
+from core.config import RAG_CACHE_DIR
+
+MANIFEST_NAME = "manifest.json"
+
+
+def document_hash(doc):
+    payload = json.dumps(
+        {"content": doc.page_content, "metadata": doc.metadata},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_manifest(index_dir):
+    path = os.path.join(index_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_index(index_dir, embeddings):
+    try:
+        import faiss
+
+        io_flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+        return FAISS.load_local(
+            index_dir,
+            embeddings,
+            allow_dangerous_deserialization=True,  # our own pickle, written below
+            io_flags=io_flags,
+        )
+    except TypeError:
+        # Older langchain-community without io_flags: read it into memory
+        return FAISS.load_local(
+            index_dir, embeddings, allow_dangerous_deserialization=True
+        )
+
+
+def _build_index(docs, embeddings, index_dir, manifest):
+    texts = [doc.page_content for doc in docs]
+    # Cached vectors for unchanged documents, the backend only for new ones
+    vectors = embeddings.embed_documents(texts)
+    vectorstore = FAISS.from_embeddings(
+        list(zip(texts, vectors)),
+        embeddings,
+        metadatas=[doc.metadata for doc in docs],
+    )
+
+    tmp_dir = index_dir + ".part"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    vectorstore.save_local(tmp_dir)
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    shutil.rmtree(index_dir, ignore_errors=True)
+    os.replace(tmp_dir, index_dir)
+    return vectorstore
+
+
+def load_or_build_vectorstore(docs, embeddings, cache_dir=None):
+    """
+    The FAISS index for ``docs``, from disk when nothing changed.
+
+    The saved index is reused (memory-mapped) when the documents and the
+    embedding model match its manifest. Otherwise it is rebuilt from
+    ``embeddings`` - a ``CachedEmbeddings``, so only new or changed
+    documents cost embedding calls - and saved for the next start.
+    """
+    index_dir = os.path.join(cache_dir or RAG_CACHE_DIR, "faiss", embeddings.model_id)
+    manifest = {
+        "model_id": embeddings.model_id,
+        "documents": [document_hash(doc) for doc in docs],
+    }
+
+    started = time.perf_counter()
+    if _read_manifest(index_dir) == manifest:
+        vectorstore = _load_index(index_dir, embeddings)
+        action = "Loaded"
+    else:
+        vectorstore = _build_index(docs, embeddings, index_dir, manifest)
+        action = "Built"
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"{action} FAISS index for {len(docs)} documents in {elapsed_ms:.1f} ms")
+    return vectorstore
@@ -0,0 +1,103 @@
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def s3_event_body(index, bucket_name):
+    # An S3 notification for a key that may not exist: head_object still
+    # makes the round trip to S3, which is what we want to measure
+    return {'Records': [{
+        'eventName': 'ObjectCreated:Put',
+        's3': {'bucket': {'name': bucket_name}, 'object': {'key': f'load-test/{index}.txt'}}
+    }]}
+
+def sqs_message_body(index, bucket_name):
+    return {'message': f'load test message {index}'}
+
+# target -> (default server URL, method, path, JSON body builder)
+TARGETS = {
+    's3-files': ('http://localhost:8080', 'GET', '/files', None),
+    's3-event': ('http://localhost:8080', 'POST', '/', s3_event_body),
+    'sqs-messages': ('http://localhost:8081', 'GET', '/messages', None),
+    'sqs-send': ('http://localhost:8081', 'POST', '/send-message', sqs_message_body),
+}
+
+def make_request(base_url, target, index, bucket_name):
+    """One request against the Lambda HTTP server; returns its latency in seconds"""
+    _, method, path, build_body = TARGETS[target]
+    if build_body is not None:
+        request = urllib.request.Request(
+            base_url + path,
+            data=json.dumps(build_body(index, bucket_name)).encode('utf-8'),
+            headers={'Content-Type': 'application/json'},
+            method=method
+        )
+    else:
+        request = urllib.request.Request(base_url + path, method=method)
+
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+    return time.perf_counter() - started
+
+def run_load_test(base_url, target, clients, total_requests, bucket_name='test-bucket'):
+    """Send total_requests requests from `clients` concurrent clients"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def client():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            try:
+                latency = make_request(base_url, target, index, bucket_name)
+                with lock:
+                    latencies.append(latency)
+            except (urllib.error.URLError, OSError) as e:
+                with lock:
+                    errors.append(str(e))
+
+    print(f"🚀 {total_requests} {target} requests to {base_url} from {clients} concurrent clients...")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        for _ in range(clients):
+            executor.submit(client)
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ {len(latencies)} succeeded, {len(errors)} failed in {elapsed:.2f}s")
+    print(f"   Throughput: {len(latencies) / elapsed:.1f} requests/sec")
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        print(
+            f"   Latency ms: p50 {cuts[49] * 1000:.1f}, p95 {cuts[94] * 1000:.1f}, "
+            f"p99 {cuts[98] * 1000:.1f}, max {max(latencies) * 1000:.1f}"
+        )
+    if errors:
+        print(f"❌ First error: {errors[0]}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the S3 / SQS simulator Lambda HTTP servers')
+    parser.add_argument('target', choices=sorted(TARGETS),
+                        help='s3-files lists the bucket, s3-event posts S3 notifications, '
+                             'sqs-messages receives, sqs-send sends one message each')
+    parser.add_argument('--url', help='Lambda server URL (default: the target simulator on localhost)')
+    parser.add_argument('--clients', type=int, default=20, help='concurrent clients (default: 20)')
+    parser.add_argument('--requests', type=int, default=500, help='total requests (default: 500)')
+    parser.add_argument('--bucket', default='test-bucket', help='bucket named in s3-event notifications')
+    args = parser.parse_args()
+    if args.clients < 1 or args.requests < 1:
+        parser.error('--clients and --requests must be at least 1')
+
+    base_url = (args.url or TARGETS[args.target][0]).rstrip('/')
+    run_load_test(base_url, args.target, args.clients, args.requests, args.bucket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles connections concurrently on a bounded thread pool,
+    so one slow request no longer blocks all the others.
+
+    At most max_workers connections are handled at a time; while all workers
+    are busy no more connections are accepted, so the rest wait in the listen
+    backlog (request_queue_size) instead of piling up in memory.
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, max_workers):
+        super().__init__(server_address, handler_class)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='http-worker')
+        self.slots = threading.BoundedSemaphore(max_workers)
+
+    def process_request(self, request, client_address):
+        # Blocks the accept loop while every worker is busy
+        self.slots.acquire()
+        try:
+            self.executor.submit(self.process_request_thread, request, client_address)
+        except BaseException:
+            self.slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
@@ -1,25 +1,95 @@
 import boto3
 import os
 import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import threading
+import sys
+from http.server import BaseHTTPRequestHandler
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-def lambda_handler(event, context=None):
-    """AWS Lambda handler for SQS events"""
-    print(f"Received event: {json.dumps(event, indent=2)}")
+# pooled_server.py is shared by both simulators: copied next to this file in
+# the container, found in ../../simulator-common when run from the repo
+try:
+    from pooled_server import PooledHTTPServer
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'simulator-common'))
+    from pooled_server import PooledHTTPServer
+
+# Shared by every request thread: pooled connections, bounded retries with
+# backoff, and a read timeout longer than the longest long poll
+BOTO_CONFIG = Config(
+    max_pool_connections=int(os.getenv('BOTO_MAX_POOL_CONNECTIONS', 50)),
+    retries={'max_attempts': int(os.getenv('BOTO_MAX_ATTEMPTS', 5)), 'mode': 'adaptive'},
+    connect_timeout=float(os.getenv('BOTO_CONNECT_TIMEOUT', 5)),
+    read_timeout=float(os.getenv('BOTO_READ_TIMEOUT', 30)),
+    tcp_keepalive=True
+)
+
+_sqs_client = None
+_queue_urls = {}
+_client_lock = threading.Lock()
+
+def get_sqs_client():
+    """SQS client built once per process (clients are thread-safe, creating them is not)"""
+    global _sqs_client
+    if _sqs_client is None:
+        with _client_lock:
+            if _sqs_client is None:
+                _sqs_client = boto3.client(
+                    'sqs',
+                    endpoint_url=os.getenv('SQS_ENDPOINT', 'http://localstack:4566'),
+                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
+                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
+                    region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1'),
+                    config=BOTO_CONFIG
+                )
+    return _sqs_client
+
+def get_queue_url(queue_name=None):
+    """Queue URL, looked up once per queue name"""
+    queue_name = queue_name or os.getenv('SQS_QUEUE_NAME', 'test-queue')
+    queue_url = _queue_urls.get(queue_name)
+    if queue_url is None:
+        queue_url = get_sqs_client().get_queue_url(QueueName=queue_name)['QueueUrl']
+        _queue_urls[queue_name] = queue_url
+    return queue_url
+
+def forget_queue_url(queue_name=None):
+    """Drop a cached URL, e.g. after the queue was deleted and recreated"""
+    _queue_urls.pop(queue_name or os.getenv('SQS_QUEUE_NAME', 'test-queue'), None)
+
+def lambda_handler(event, context=None, log_event=True):
+    """AWS Lambda handler for SQS events
+
+    The background consumer passes log_event=False: it invokes the handler for
+    every batch, so only a one-line summary is logged instead of the event and
+    its messages.
+    """
+    if log_event:
+        print(f"Received event: {json.dumps(event, indent=2)}")
+    else:
+        print(f"Received {len(event.get('Records', []))} SQS records")
+    
+    # Records that failed, reported back so only they are retried
+    batch_item_failures = []
     
     try:
         if 'Records' in event:
             for record in event['Records']:
-                message_body = record.get('body', '')
-                receipt_handle = record.get('receiptHandle', '')
                 message_id = record.get('messageId', '')
-                
-                print(f"🎯 SQS Message Received!")
-                print(f"   Message ID: {message_id}")
-                print(f"   Body: {message_body}")
-                print(f"   Receipt Handle: {receipt_handle[:20]}...")
-                print("-" * 50)
+                try:
+                    message_body = record.get('body', '')
+                    receipt_handle = record.get('receiptHandle', '')
+                    
+                    if log_event:
+                        print(f"🎯 SQS Message Received!")
+                        print(f"   Message ID: {message_id}")
+                        print(f"   Body: {message_body}")
+                        print(f"   Receipt Handle: {receipt_handle[:20]}...")
+                        print("-" * 50)
+                except Exception as e:
+                    print(f"❌ Error processing message {message_id}: {e}")
+                    batch_item_failures.append({'itemIdentifier': message_id})
         else:
             print("No SQS records found in event")
             
@@ -32,9 +102,174 @@ def lambda_handler(event, context=None):
     
     return {
         'statusCode': 200,
-        'body': json.dumps('Lambda function executed successfully')
+        'body': json.dumps('Lambda function executed successfully'),
+        'batchItemFailures': batch_item_failures
     }
 
+def message_to_record(message, queue_arn=''):
+    """A received SQS message in the shape Lambda passes in event['Records']"""
+    return {
+        'messageId': message['MessageId'],
+        'receiptHandle': message['ReceiptHandle'],
+        'body': message['Body'],
+        'attributes': message.get('Attributes', {}),
+        'messageAttributes': {
+            name: {
+                'stringValue': value.get('StringValue'),
+                'binaryValue': value.get('BinaryValue'),
+                'dataType': value.get('DataType')
+            }
+            for name, value in message.get('MessageAttributes', {}).items()
+        },
+        'md5OfBody': message.get('MD5OfBody', ''),
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': queue_arn,
+        'awsRegion': os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
+    }
+
+# The heartbeat extends visibility every half timeout; below this it would
+# spin on change_message_visibility_batch
+MIN_VISIBILITY_TIMEOUT = 2
+
+class VisibilityHeartbeat:
+    """Keeps a batch's messages invisible while it is still being processed.
+
+    Every half visibility timeout the in-flight receipt handles get a fresh
+    timeout, so a slow batch is not redelivered to another poller meanwhile.
+    """
+
+    def __init__(self, queue_url, receipt_handles, visibility_timeout):
+        self.queue_url = queue_url
+        self.receipt_handles = receipt_handles
+        self.visibility_timeout = visibility_timeout
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._done.wait(self.visibility_timeout / 2):
+            try:
+                response = get_sqs_client().change_message_visibility_batch(
+                    QueueUrl=self.queue_url,
+                    Entries=[
+                        {'Id': str(i), 'ReceiptHandle': handle, 'VisibilityTimeout': self.visibility_timeout}
+                        for i, handle in enumerate(self.receipt_handles)
+                    ]
+                )
+                print(f"⏳ Extended visibility of {len(self.receipt_handles)} slow messages by {self.visibility_timeout}s")
+                for failure in response.get('Failed', []):
+                    print(f"   Could not extend message {failure['Id']}: {failure.get('Message', failure['Code'])}")
+            except ClientError as e:
+                print(f"❌ Error extending message visibility: {e}")
+
+class SQSConsumer:
+    """Background pollers feeding the queue to lambda_handler, like Lambda's SQS trigger.
+
+    Each poller long-polls for up to `batch_size` messages, passes them to
+    lambda_handler as one event and deletes the processed ones with a single
+    delete_message_batch. Messages listed in the response's batchItemFailures
+    (or the whole batch, if the handler fails) are left on the queue and come
+    back after the visibility timeout.
+    """
+
+    def __init__(self, pollers=1, queue_name=None, batch_size=10, wait_time_seconds=20, visibility_timeout=30):
+        if visibility_timeout < MIN_VISIBILITY_TIMEOUT:
+            raise ValueError(f"visibility_timeout must be at least {MIN_VISIBILITY_TIMEOUT}s, got {visibility_timeout}")
+        self.pollers = pollers
+        self.queue_name = queue_name or os.getenv('SQS_QUEUE_NAME', 'test-queue')
+        self.batch_size = min(batch_size, 10)
+        self.wait_time_seconds = min(wait_time_seconds, 20)
+        self.visibility_timeout = visibility_timeout
+        self.processed = 0
+        self.failed = 0
+        self._stats_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._queue_arn = None
+
+    def start(self):
+        for i in range(self.pollers):
+            thread = threading.Thread(target=self._poll, name=f'sqs-poller-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"📥 {self.pollers} SQS pollers consuming {self.queue_name} "
+              f"(batches of {self.batch_size}, {self.wait_time_seconds}s long polls)")
+
+    def stop(self, timeout=None):
+        """Stop polling; a poller in the middle of a long poll finishes it first"""
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        print(f"📥 SQS pollers stopped: {self.processed} messages processed, {self.failed} failed")
+
+    def _get_queue_arn(self, queue_url):
+        if self._queue_arn is None:
+            attributes = get_sqs_client().get_queue_attributes(QueueUrl=queue_url, AttributeNames=['QueueArn'])
+            self._queue_arn = attributes['Attributes'].get('QueueArn', '')
+        return self._queue_arn
+
+    def _poll(self):
+        while not self._stopping.is_set():
+            try:
+                queue_url = get_queue_url(self.queue_name)
+                response = get_sqs_client().receive_message(
+                    QueueUrl=queue_url,
+                    MaxNumberOfMessages=self.batch_size,
+                    WaitTimeSeconds=self.wait_time_seconds,
+                    VisibilityTimeout=self.visibility_timeout,
+                    AttributeNames=['All'],
+                    MessageAttributeNames=['All']
+                )
+                messages = response.get('Messages', [])
+                if messages:
+                    self.process_batch(queue_url, messages)
+            except ClientError as e:
+                print(f"❌ Error polling {self.queue_name}: {e}")
+                forget_queue_url(self.queue_name)
+                self._stopping.wait(5)
+            except Exception as e:
+                print(f"❌ Unexpected error in SQS poller: {e}")
+                self._stopping.wait(5)
+
+    def process_batch(self, queue_url, messages):
+        """Run one received batch through lambda_handler and delete what succeeded"""
+        queue_arn = self._get_queue_arn(queue_url)
+        event = {'Records': [message_to_record(message, queue_arn) for message in messages]}
+
+        with VisibilityHeartbeat(queue_url, [m['ReceiptHandle'] for m in messages], self.visibility_timeout):
+            try:
+                result = lambda_handler(event, log_event=False)
+            except Exception as e:
+                print(f"❌ Lambda handler failed on a batch of {len(messages)}: {e}")
+                result = {'statusCode': 500}
+
+        batch_ids = {m['MessageId'] for m in messages}
+        if result.get('statusCode') != 200:
+            failed_ids = batch_ids
+        else:
+            failed_ids = batch_ids & {failure['itemIdentifier'] for failure in result.get('batchItemFailures', [])}
+        done = [m for m in messages if m['MessageId'] not in failed_ids]
+
+        if done:
+            response = get_sqs_client().delete_message_batch(
+                QueueUrl=queue_url,
+                Entries=[{'Id': str(i), 'ReceiptHandle': m['ReceiptHandle']} for i, m in enumerate(done)]
+            )
+            for failure in response.get('Failed', []):
+                print(f"❌ Could not delete message {done[int(failure['Id'])]['MessageId']}: "
+                      f"{failure.get('Message', failure['Code'])}")
+
+        with self._stats_lock:
+            self.processed += len(done)
+            self.failed += len(failed_ids)
+
 class LambdaHTTPHandler(BaseHTTPRequestHandler):
     """HTTP handler to simulate Lambda invocation"""
     
@@ -42,20 +277,12 @@ class LambdaHTTPHandler(BaseHTTPRequestHandler):
         """Handle GET requests to list SQS messages"""
         try:
             if self.path == '/messages':
-                sqs_client = boto3.client(
-                    'sqs',
-                    endpoint_url=os.getenv('SQS_ENDPOINT', 'http://localstack:4566'),
-                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
-                    region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-                )
+                sqs_client = get_sqs_client()
                 
                 queue_name = os.getenv('SQS_QUEUE_NAME', 'test-queue')
                 
                 try:
-                    # Get queue URL
-                    queue_url_response = sqs_client.get_queue_url(QueueName=queue_name)
-                    queue_url = queue_url_response['QueueUrl']
+                    queue_url = get_queue_url(queue_name)
                     
                     # Receive messages (up to 10)
                     response = sqs_client.receive_message(
@@ -96,6 +323,7 @@ class LambdaHTTPHandler(BaseHTTPRequestHandler):
                     }).encode('utf-8'))
                     
                 except ClientError as e:
+                    forget_queue_url(queue_name)
                     self.send_response(404)
                     self.send_header('Content-Type', 'application/json')
                     self.send_header('Access-Control-Allow-Origin', '*')
@@ -123,17 +351,8 @@ class LambdaHTTPHandler(BaseHTTPRequestHandler):
                     data = json.loads(body)
                     message_body = data.get('message', '')
                     
-                    sqs_client = boto3.client(
-                        'sqs',
-                        endpoint_url=os.getenv('SQS_ENDPOINT', 'http://localstack:4566'),
-                        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-                        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
-                        region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-                    )
-                    
-                    queue_name = os.getenv('SQS_QUEUE_NAME', 'test-queue')
-                    queue_url_response = sqs_client.get_queue_url(QueueName=queue_name)
-                    queue_url = queue_url_response['QueueUrl']
+                    sqs_client = get_sqs_client()
+                    queue_url = get_queue_url()
                     
                     response = sqs_client.send_message(
                         QueueUrl=queue_url,
@@ -154,17 +373,8 @@ class LambdaHTTPHandler(BaseHTTPRequestHandler):
                     data = json.loads(body)
                     receipt_handle = data.get('receiptHandle', '')
                     
-                    sqs_client = boto3.client(
-                        'sqs',
-                        endpoint_url=os.getenv('SQS_ENDPOINT', 'http://localstack:4566'),
-                        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID', 'test'),
-                        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY', 'test'),
-                        region_name=os.getenv('AWS_DEFAULT_REGION', 'us-east-1')
-                    )
-                    
-                    queue_name = os.getenv('SQS_QUEUE_NAME', 'test-queue')
-                    queue_url_response = sqs_client.get_queue_url(QueueName=queue_name)
-                    queue_url = queue_url_response['QueueUrl']
+                    sqs_client = get_sqs_client()
+                    queue_url = get_queue_url()
                     
                     sqs_client.delete_message(
                         QueueUrl=queue_url,
@@ -221,13 +431,30 @@ def main():
     port = int(os.getenv('LAMBDA_PORT', 8081))
     print(f"🚀 Lambda function server starting on port {port}...")
     
-    server = HTTPServer(('0.0.0.0', port), LambdaHTTPHandler)
-    
+    workers = int(os.getenv('LAMBDA_WORKERS', 32))
+    server = PooledHTTPServer(('0.0.0.0', port), LambdaHTTPHandler, max_workers=workers)
+    print(f"   Handling up to {workers} requests concurrently")
+
+    # Off by default: the frontend reads the queue through GET /messages
+    consumer = None
+    pollers = int(os.getenv('SQS_CONSUMERS', 0))
+    if pollers > 0:
+        consumer = SQSConsumer(
+            pollers=pollers,
+            batch_size=int(os.getenv('SQS_BATCH_SIZE', 10)),
+            wait_time_seconds=int(os.getenv('SQS_WAIT_TIME_SECONDS', 20)),
+            visibility_timeout=int(os.getenv('SQS_VISIBILITY_TIMEOUT', 30))
+        )
+        consumer.start()
+
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down lambda function...")
-        server.shutdown()
+    finally:
+        if consumer is not None:
+            consumer.stop(timeout=1)
+        server.server_close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,27 +2,62 @@ import boto3
 import os
 import sys
 import json
-from botocore.exceptions import ClientError
+import statistics
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+QUEUE_NAME = 'test-queue'
+# send_message_batch takes at most 10 entries
+BATCH_SIZE = 10
+DEFAULT_CONCURRENCY = 8
+
+_sqs_client = None
+_queue_url = None
+_client_lock = threading.Lock()
+
+def get_sqs_client():
+    """One SQS client for the whole run, with enough connections for concurrent batches"""
+    global _sqs_client
+    if _sqs_client is None:
+        with _client_lock:
+            if _sqs_client is None:
+                _sqs_client = boto3.client(
+                    'sqs',
+                    endpoint_url='http://localhost:4566',
+                    aws_access_key_id='test',
+                    aws_secret_access_key='test',
+                    region_name='us-east-1',
+                    config=Config(max_pool_connections=50, retries={'max_attempts': 5, 'mode': 'adaptive'})
+                )
+    return _sqs_client
+
+def get_queue_url():
+    """Queue URL, looked up once"""
+    global _queue_url
+    if _queue_url is None:
+        _queue_url = get_sqs_client().get_queue_url(QueueName=QUEUE_NAME)['QueueUrl']
+    return _queue_url
+
+def report_queue_error(e):
+    error_code = e.response['Error']['Code']
+    if error_code == 'AWS.SimpleQueueService.NonExistentQueue':
+        print(f"Error: Queue '{QUEUE_NAME}' does not exist!")
+        print("Make sure LocalStack services are running with: docker-compose up")
+    else:
+        print(f"Error sending message: {e}")
 
 def send_message_to_sqs(message_body):
     """Send a message to SQS queue using LocalStack"""
     
     print(f"Sending message to SQS queue: {message_body}")
     
-    sqs_client = boto3.client(
-        'sqs',
-        endpoint_url='http://localhost:4566',
-        aws_access_key_id='test',
-        aws_secret_access_key='test',
-        region_name='us-east-1'
-    )
-    
-    queue_name = 'test-queue'
+    sqs_client = get_sqs_client()
     
     try:
-        # Get queue URL
-        queue_url_response = sqs_client.get_queue_url(QueueName=queue_name)
-        queue_url = queue_url_response['QueueUrl']
+        queue_url = get_queue_url()
         print(f"Queue URL: {queue_url}")
         
         # Send message
@@ -45,36 +80,80 @@ def send_message_to_sqs(message_body):
         print(f"   Messages in queue: {message_count}")
         
     except ClientError as e:
-        error_code = e.response['Error']['Code']
-        if error_code == 'AWS.SimpleQueueService.NonExistentQueue':
-            print(f"Error: Queue '{queue_name}' does not exist!")
-            print("Make sure LocalStack services are running with: docker-compose up")
-        else:
-            print(f"Error sending message: {e}")
+        report_queue_error(e)
         sys.exit(1)
     except Exception as e:
         print(f"Unexpected error: {e}")
         sys.exit(1)
 
+def send_batch(queue_url, messages):
+    """Send up to 10 messages in one call; returns (sent, failed, seconds)"""
+    started = time.perf_counter()
+    response = get_sqs_client().send_message_batch(
+        QueueUrl=queue_url,
+        Entries=[{'Id': str(i), 'MessageBody': body} for i, body in enumerate(messages)]
+    )
+    elapsed = time.perf_counter() - started
+    failed = response.get('Failed', [])
+    for failure in failed:
+        print(f"❌ Message {failure['Id']} failed: {failure.get('Message', failure['Code'])}")
+    return len(response.get('Successful', [])), len(failed), elapsed
+
+def bulk_send_to_sqs(messages, concurrency=DEFAULT_CONCURRENCY):
+    """Send messages in batches of 10, `concurrency` batches at a time, and report throughput"""
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    try:
+        queue_url = get_queue_url()
+    except ClientError as e:
+        report_queue_error(e)
+        sys.exit(1)
+    except BotoCoreError as e:
+        # e.g. EndpointConnectionError while LocalStack is not up yet
+        print(f"Error: could not reach SQS: {e}")
+        print("Make sure LocalStack services are running with: docker-compose up")
+        sys.exit(1)
+    
+    batches = [messages[i:i + BATCH_SIZE] for i in range(0, len(messages), BATCH_SIZE)]
+    print(f"🚀 Sending {len(messages)} messages in {len(batches)} batches, {concurrency} at a time...")
+    
+    sent = 0
+    failed = 0
+    latencies = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [(executor.submit(send_batch, queue_url, batch), batch) for batch in batches]
+        for future, batch in futures:
+            try:
+                batch_sent, batch_failed, elapsed = future.result()
+            except (ClientError, BotoCoreError) as e:
+                print(f"❌ Batch failed: {e}")
+                failed += len(batch)
+                continue
+            sent += batch_sent
+            failed += batch_failed
+            latencies.append(elapsed)
+    elapsed = time.perf_counter() - started
+    
+    print(f"✅ Sent {sent} messages ({failed} failed) in {elapsed:.2f}s")
+    print(f"   Throughput: {sent / elapsed:.1f} messages/sec")
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+        print(
+            f"   Batch latency ms: p50 {cuts[49] * 1000:.1f}, "
+            f"p95 {cuts[94] * 1000:.1f}, p99 {cuts[98] * 1000:.1f}"
+        )
+    return sent, failed
+
 def receive_messages_from_sqs():
     """Receive messages from SQS queue"""
     
     print("Receiving messages from SQS queue...")
     
-    sqs_client = boto3.client(
-        'sqs',
-        endpoint_url='http://localhost:4566',
-        aws_access_key_id='test',
-        aws_secret_access_key='test',
-        region_name='us-east-1'
-    )
-    
-    queue_name = 'test-queue'
+    sqs_client = get_sqs_client()
     
     try:
-        # Get queue URL
-        queue_url_response = sqs_client.get_queue_url(QueueName=queue_name)
-        queue_url = queue_url_response['QueueUrl']
+        queue_url = get_queue_url()
         
         # Receive messages
         response = sqs_client.receive_message(
@@ -108,6 +187,7 @@ def main():
         print("  python send_message_test.py send '<message>'")
         print("  python send_message_test.py receive")
         print("  python send_message_test.py demo")
+        print("  python send_message_test.py bulk <count> [concurrency]")
         sys.exit(1)
     
     action = sys.argv[1].lower()
@@ -134,16 +214,30 @@ def main():
         ]
         
         print("🚀 Demo: Sending sample messages to SQS...")
-        for i, message in enumerate(demo_messages, 1):
-            print(f"\n--- Sending message {i}/{len(demo_messages)} ---")
-            send_message_to_sqs(message)
+        sent, _ = bulk_send_to_sqs(demo_messages)
         
-        print(f"\n✅ Demo completed! Sent {len(demo_messages)} messages.")
+        print(f"\n✅ Demo completed! Sent {sent} messages.")
         print("You can now view them in the web UI at http://localhost:3001")
         
+    elif action == 'bulk':
+        try:
+            count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+            concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_CONCURRENCY
+        except ValueError:
+            count = concurrency = 0
+        if count < 1 or concurrency < 1:
+            print("Usage: python send_message_test.py bulk <count> [concurrency]")
+            print("       count and concurrency must be positive integers")
+            sys.exit(1)
+        messages = [
+            json.dumps({"event": "bulk_test", "sequence": i, "sent_at": time.time()})
+            for i in range(count)
+        ]
+        bulk_send_to_sqs(messages, concurrency)
+        
     else:
         print(f"Unknown action: {action}")
-        print("Available actions: send, receive, demo")
+        print("Available actions: send, receive, demo, bulk")
         sys.exit(1)
 
 if __name__ == "__main__":
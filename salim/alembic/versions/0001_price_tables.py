@@ -0,0 +1,70 @@
+"""Create stores, items, prices and ingest_runs tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "stores",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("chain_id", sa.Text, nullable=False),
+        sa.Column("store_id", sa.Text, nullable=False),
+        sa.Column("name", sa.Text),
+        sa.UniqueConstraint("chain_id", "store_id", name="uq_stores_chain_store"),
+    )
+    op.create_table(
+        "items",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("item_code", sa.Text, nullable=False, unique=True),
+        sa.Column("item_name", sa.Text),
+        sa.Column("manufacturer_name", sa.Text),
+        sa.Column("quantity", sa.Numeric),
+        sa.Column("unit_qty", sa.Text),
+        sa.Column("unit_of_measure", sa.Text),
+    )
+    op.create_table(
+        "prices",
+        sa.Column("store_pk", sa.Integer, sa.ForeignKey("stores.id"), primary_key=True),
+        sa.Column("item_pk", sa.Integer, sa.ForeignKey("items.id"), primary_key=True),
+        sa.Column("price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("unit_price", sa.Numeric(12, 4)),
+        sa.Column("price_update_date", sa.DateTime),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    # Lookups by item across stores (the primary key leads with store_pk)
+    op.create_index("ix_prices_item_pk", "prices", ["item_pk"])
+    op.create_table(
+        "ingest_runs",
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("files", sa.Integer, nullable=False),
+        sa.Column("rows", sa.BigInteger, nullable=False),
+        sa.Column(
+            "finished_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("ingest_runs")
+    op.drop_index("ix_prices_item_pk", table_name="prices")
+    op.drop_table("prices")
+    op.drop_table("items")
+    op.drop_table("stores")
@@ -0,0 +1,28 @@
+"""Trigram index on item names for product search
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serves ILIKE '%word%' and similarity() on item names
+    op.create_index(
+        "ix_items_item_name_trgm",
+        "items",
+        ["item_name"],
+        postgresql_using="gin",
+        postgresql_ops={"item_name": "gin_trgm_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_items_item_name_trgm", table_name="items")
@@ -0,0 +1,32 @@
+"""Key items by (item_scope, item_code) instead of a global item_code
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing items keep the global scope ('')
+    op.add_column(
+        "items",
+        sa.Column("item_scope", sa.Text, nullable=False, server_default=""),
+    )
+    op.drop_constraint("items_item_code_key", "items", type_="unique")
+    op.create_unique_constraint(
+        "uq_items_scope_code", "items", ["item_scope", "item_code"]
+    )
+
+
+def downgrade():
+    op.drop_constraint("uq_items_scope_code", "items", type_="unique")
+    # Fails if two chains share an internal code; merge those items first
+    op.create_unique_constraint("items_item_code_key", "items", ["item_code"])
+    op.drop_column("items", "item_scope")
@@ -0,0 +1,4 @@
+# Cheapest-basket package
+from .index import PriceIndex, PriceIndexHolder, price_index
+
+__all__ = ["PriceIndex", "PriceIndexHolder", "price_index"]
@@ -0,0 +1,324 @@
+import threading
+import time
+
+import numpy as np
+
+from ..core.config import settings
+from ..db.engine import get_engine
+from ..db.version import DATA_VERSION_SQL
+
+STORES_SQL = "SELECT id, chain_id, store_id, name FROM stores ORDER BY id"
+ITEMS_SQL = "SELECT id, item_scope, item_code, item_name FROM items ORDER BY id"
+PRICES_SQL = "SELECT item_pk, store_pk, price FROM prices"
+
+# Rows fetched per round trip while loading prices
+FETCH_SIZE = 100_000
+
+
+class PriceIndex:
+    """
+    Latest prices in a sparse per-item layout (CSR).
+
+    The prices of item row ``r`` are ``prices[indptr[r]:indptr[r + 1]]``, sold
+    at the stores ``store_cols[indptr[r]:indptr[r + 1]]``. Memory grows with
+    the number of prices actually ingested rather than items x stores, so a
+    large catalogue (and every worker's copy after a reload) stays small.
+
+    Items are keyed by ``(item_scope, item_code)``: barcodes have the global
+    scope ``""``, chain-internal codes the chain's id, so two chains' internal
+    items that share a code are never merged. A basket code is priced at each
+    store from the global item, or else from the store's own chain's item.
+
+    A basket is a handful of items, so totalling it across every store is one
+    vectorized sum instead of an items x stores join in SQL per request.
+    """
+
+    def __init__(
+        self,
+        data_version,
+        stores,
+        item_ids,
+        item_scopes,
+        item_codes,
+        item_names,
+        indptr,
+        store_cols,
+        prices,
+    ):
+        self.data_version = data_version
+        self.stores = stores
+        self.item_ids = item_ids
+        self.item_scopes = item_scopes
+        self.item_codes = item_codes
+        self.item_names = item_names
+        self.item_rows = {
+            (scope, code): row
+            for row, (scope, code) in enumerate(zip(item_scopes, item_codes))
+        }
+        self.chain_ids = sorted({store["chain_id"] for store in stores})
+        self.indptr = indptr
+        self.store_cols = store_cols
+        self.prices = prices
+        self.loaded_at = time.time()
+
+    @classmethod
+    def empty(cls, data_version=None):
+        return cls(
+            data_version,
+            [],
+            [],
+            [],
+            [],
+            [],
+            np.zeros(1, dtype=np.int64),
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.float32),
+        )
+
+    @classmethod
+    def load(cls, connection):
+        """Build the index from the prices tables (psycopg2 connection)"""
+        cursor = connection.cursor()
+        # One snapshot for all the queries below, even while ingesting
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        cursor.execute(DATA_VERSION_SQL)
+        data_version = cursor.fetchone()[0]
+
+        cursor.execute(STORES_SQL)
+        store_rows = cursor.fetchall()
+        cursor.execute(ITEMS_SQL)
+        item_rows = cursor.fetchall()
+        if not store_rows or not item_rows:
+            cursor.close()
+            connection.rollback()
+            return cls.empty(data_version)
+        cursor.close()
+
+        stores = [
+            {"chain_id": chain_id, "store_id": store_id, "name": name}
+            for _, chain_id, store_id, name in store_rows
+        ]
+        item_ids = [pk for pk, _, _, _ in item_rows]
+        item_scopes = [scope for _, scope, _, _ in item_rows]
+        item_codes = [code for _, _, code, _ in item_rows]
+        item_names = [name for _, _, _, name in item_rows]
+
+        # Primary key -> row / column position, so whole fetches map at once
+        store_col = np.full(store_rows[-1][0] + 1, -1, dtype=np.int32)
+        store_col[[pk for pk, *_ in store_rows]] = np.arange(len(store_rows))
+        item_row = np.full(item_ids[-1] + 1, -1, dtype=np.int64)
+        item_row[item_ids] = np.arange(len(item_rows))
+
+        rows, cols, values = [], [], []
+        # Server-side cursor: stream the prices instead of one huge fetch
+        cursor = connection.cursor(name="price_index")
+        cursor.itersize = FETCH_SIZE
+        cursor.execute(PRICES_SQL)
+        while True:
+            chunk = cursor.fetchmany(FETCH_SIZE)
+            if not chunk:
+                break
+            array = np.array(chunk, dtype=np.float64)
+            rows.append(item_row[array[:, 0].astype(np.int64)])
+            cols.append(store_col[array[:, 1].astype(np.int64)])
+            values.append(array[:, 2].astype(np.float32))
+        cursor.close()
+        connection.rollback()
+
+        # Group the prices by item row: CSR
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(len(item_rows) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(item_rows)), out=indptr[1:])
+        store_cols = (
+            np.concatenate(cols)[order] if cols else np.empty(0, dtype=np.int32)
+        )
+        prices = (
+            np.concatenate(values)[order] if values else np.empty(0, dtype=np.float32)
+        )
+
+        return cls(
+            data_version,
+            stores,
+            item_ids,
+            item_scopes,
+            item_codes,
+            item_names,
+            indptr,
+            store_cols,
+            prices,
+        )
+
+    @property
+    def shape(self):
+        return len(self.item_codes), len(self.stores)
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.store_cols.nbytes + self.prices.nbytes
+
+    def _code_rows(self, code):
+        """Item rows for a basket code: chain-internal ones first, global last"""
+        rows = [
+            self.item_rows[(chain_id, code)]
+            for chain_id in self.chain_ids
+            if (chain_id, code) in self.item_rows
+        ]
+        if ("", code) in self.item_rows:
+            rows.append(self.item_rows[("", code)])
+        return rows
+
+    def _price_row(self, rows):
+        """Dense per-store prices of one basket code, and the item row used"""
+        prices = np.full(len(self.stores), np.nan, dtype=np.float64)
+        sources = np.full(len(self.stores), -1, dtype=np.int64)
+        # A later row overwrites an earlier one, so the global barcode wins
+        # where a store also has a chain-internal item with the same code
+        for row in rows:
+            start, end = self.indptr[row], self.indptr[row + 1]
+            cols = self.store_cols[start:end]
+            prices[cols] = self.prices[start:end]
+            sources[cols] = row
+        return prices, sources
+
+    def total_basket(self, basket, limit=5):
+        """
+        Rank stores by the total price of ``basket`` (``{item_code: quantity}``).
+
+        Stores carrying the whole basket come first, cheapest first; stores
+        missing items follow, ordered by how many items they have and then by
+        price.
+        """
+        code_rows = {code: self._code_rows(code) for code in basket}
+        codes = [code for code in basket if code_rows[code]]
+        unknown = [code for code in basket if not code_rows[code]]
+        if not codes or not self.stores:
+            return {"results": [], "unknown_items": unknown}
+
+        quantities = np.fromiter((basket[code] for code in codes), dtype=np.float64)
+
+        # basket items x stores, built from the basket's CSR rows only
+        sub = np.empty((len(codes), len(self.stores)), dtype=np.float64)
+        sources = np.empty((len(codes), len(self.stores)), dtype=np.int64)
+        for i, code in enumerate(codes):
+            sub[i], sources[i] = self._price_row(code_rows[code])
+        available = ~np.isnan(sub)
+        found = available.sum(axis=0)
+        totals = np.nansum(sub * quantities[:, None], axis=0)
+
+        # Most items first, then cheapest
+        order = np.lexsort((totals, -found))
+        order = order[found[order] > 0][:limit]
+
+        results = []
+        for col in order:
+            results.append(
+                {
+                    **self.stores[col],
+                    "total": round(float(totals[col]), 2),
+                    "items_found": int(found[col]),
+                    "complete": bool(found[col] == len(codes)),
+                    "missing_items": [
+                        code for code, ok in zip(codes, available[:, col]) if not ok
+                    ],
+                    "items": [
+                        {
+                            "item_code": code,
+                            "item_name": self.item_names[row],
+                            "quantity": float(quantity),
+                            "price": round(float(price), 2),
+                        }
+                        for code, row, quantity, price in zip(
+                            codes, sources[:, col], quantities, sub[:, col]
+                        )
+                        if not np.isnan(price)
+                    ],
+                }
+            )
+        return {"results": results, "unknown_items": unknown}
+
+
+class PriceIndexHolder:
+    """
+    The current ``PriceIndex`` plus its reloading.
+
+    Every ``refresh_seconds`` the latest ``ingest_runs`` id is compared with
+    the loaded data version; on a change a new index is built in a background
+    thread and swapped in, while requests keep using the old one.
+    """
+
+    def __init__(self, refresh_seconds=None):
+        self.refresh_seconds = (
+            settings.price_index_refresh_seconds
+            if refresh_seconds is None
+            else refresh_seconds
+        )
+        self._index = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refreshing = False
+        self._checked_at = 0.0
+
+    def current(self):
+        return self._index
+
+    def ensure_loaded(self):
+        """The current index, building it first if there is none yet"""
+        with self._load_lock:
+            if self._index is None:
+                self.load()
+        return self._index
+
+    def load(self):
+        """Build the index now (blocking) and return it"""
+        connection = get_engine().raw_connection()
+        try:
+            started = time.perf_counter()
+            index = PriceIndex.load(connection)
+        finally:
+            connection.close()
+        elapsed = time.perf_counter() - started
+        items, stores = index.shape
+        print(
+            f"✅ Price index v{index.data_version}: {len(index.prices)} prices, "
+            f"{items} items x {stores} stores, {index.nbytes / 1e6:.1f} MB "
+            f"in {elapsed:.2f}s"
+        )
+        with self._lock:
+            self._index = index
+            self._checked_at = time.monotonic()
+        return index
+
+    def invalidate(self):
+        """Check for a new data version on the next request"""
+        self._checked_at = 0.0
+
+    def refresh_if_due(self):
+        with self._lock:
+            elapsed = time.monotonic() - self._checked_at
+            if self._refreshing or elapsed < self.refresh_seconds:
+                return
+            self._refreshing = True
+            self._checked_at = time.monotonic()
+        threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self):
+        try:
+            connection = get_engine().raw_connection()
+            try:
+                cursor = connection.cursor()
+                cursor.execute(DATA_VERSION_SQL)
+                data_version = cursor.fetchone()[0]
+                cursor.close()
+            finally:
+                connection.close()
+            if self._index is None or data_version != self._index.data_version:
+                self.load()
+        except Exception as e:
+            print(f"❌ Error refreshing price index: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+
+price_index = PriceIndexHolder()
@@ -0,0 +1,20 @@
+# Response caching package
+from .middleware import ResponseCacheMiddleware
+from .store import (
+    CachedResponse,
+    LRUCache,
+    RedisCache,
+    TieredCache,
+    create_cache,
+    response_cache,
+)
+
+__all__ = [
+    "CachedResponse",
+    "LRUCache",
+    "RedisCache",
+    "ResponseCacheMiddleware",
+    "TieredCache",
+    "create_cache",
+    "response_cache",
+]
@@ -0,0 +1,153 @@
+import hashlib
+from urllib.parse import parse_qsl, urlencode
+
+from ..core.config import settings
+from ..db.version import data_version
+from .store import CachedResponse, response_cache
+
+# Set by a route when it served data from another version than the current
+# one (e.g. an in-memory index that has not reloaded yet); never cached
+DATA_VERSION_HEADER = b"x-data-version"
+# A route sends ``Cache-Control: no-store`` to keep a response out of the
+# cache altogether, e.g. degraded fallback results
+NO_STORE = b"no-store"
+
+
+def cache_key(path, query_string):
+    """Route plus normalized query: ``?b=2&a=1`` and ``?a=1&b=2`` share an entry"""
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    return f"{path}?{urlencode(params)}"
+
+
+def make_etag(version, key):
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'.encode()
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == b"*":
+        return True
+    return any(tag.strip() == etag for tag in if_none_match.split(b","))
+
+
+class ResponseCacheMiddleware:
+    """
+    Cache successful GET responses under ``prefix`` (except ``exclude``).
+
+    Entries are keyed by the price data version plus the route and its
+    normalized query, so an ingestion run invalidates everything at once
+    without any explicit purge. Responses carry a weak ETag derived from the
+    same key and a ``Cache-Control`` max-age; a request whose
+    ``If-None-Match`` matches is answered with 304 before the route runs.
+    Responses marked ``Cache-Control: no-store`` are passed through as-is.
+    """
+
+    def __init__(
+        self,
+        app,
+        prefix="/api",
+        exclude=(),
+        cache=None,
+        max_age=None,
+        max_body_bytes=None,
+    ):
+        self.app = app
+        self.prefix = prefix
+        self.exclude = tuple(exclude)
+        self.cache = cache or response_cache
+        self.max_age = settings.response_cache_max_age if max_age is None else max_age
+        self.max_body_bytes = (
+            settings.response_cache_max_body_bytes
+            if max_body_bytes is None
+            else max_body_bytes
+        )
+
+    def _cacheable(self, scope):
+        path = scope["path"]
+        return (
+            scope["type"] == "http"
+            and scope["method"] == "GET"
+            and path.startswith(self.prefix)
+            and not path.startswith(self.exclude)
+        )
+
+    async def __call__(self, scope, receive, send):
+        if not self._cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        version = await data_version.current()
+        key = cache_key(scope["path"], scope["query_string"])
+        etag = make_etag(version, key)
+        validators = [
+            (b"etag", etag),
+            (b"cache-control", f"public, max-age={self.max_age}".encode()),
+        ]
+
+        request_headers = dict(scope["headers"])
+        if etag_matches(request_headers.get(b"if-none-match"), etag):
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": validators}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        versioned_key = f"{version}:{key}"
+        cached = await self.cache.get(versioned_key)
+        if cached is not None:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": cached.status,
+                    "headers": cached.headers + [(b"x-cache", b"HIT")],
+                }
+            )
+            await send({"type": "http.response.body", "body": cached.body})
+            return
+
+        capture = self._capture(send, versioned_key, version, validators)
+        await self.app(scope, receive, capture)
+
+    def _capture(self, send, key, version, validators):
+        state = {"store": False, "headers": None, "body": []}
+        size = 0
+
+        async def send_and_capture(message):
+            nonlocal size
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                served = dict(headers).get(DATA_VERSION_HEADER)
+                current = served in (None, str(version).encode())
+                no_store = NO_STORE in dict(headers).get(b"cache-control", b"")
+                if message["status"] == 200 and current and not no_store:
+                    headers = [
+                        h for h in headers if h[0] not in (b"etag", b"cache-control")
+                    ]
+                    headers += validators
+                    state["store"] = True
+                    state["status"] = message["status"]
+                    state["headers"] = headers
+                message = {**message, "headers": headers + [(b"x-cache", b"MISS")]}
+
+            elif message["type"] == "http.response.body" and state["store"]:
+                body = message.get("body", b"")
+                size += len(body)
+                if size > self.max_body_bytes:
+                    # Too big (or streamed) to keep in memory
+                    state["store"] = False
+                    state["body"] = []
+                else:
+                    state["body"].append(body)
+                    if not message.get("more_body", False):
+                        await send(message)
+                        response = CachedResponse(
+                            state["status"], state["headers"], b"".join(state["body"])
+                        )
+                        await self.cache.set(key, response)
+                        return
+
+            await send(message)
+
+        return send_and_capture
@@ -0,0 +1,164 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..core.config import settings
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+    def to_json(self) -> bytes:
+        return json.dumps(
+            {
+                "status": self.status,
+                "headers": [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in self.headers
+                ],
+                "body": base64.b64encode(self.body).decode("ascii"),
+            }
+        ).encode()
+
+    @classmethod
+    def from_json(cls, data: bytes) -> "CachedResponse":
+        entry = json.loads(data)
+        return cls(
+            entry["status"],
+            [
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in entry["headers"]
+            ],
+            base64.b64decode(entry["body"]),
+        )
+
+
+class LRUCache:
+    """In-process LRU cache whose entries also expire after ``ttl`` seconds"""
+
+    def __init__(self, max_entries=1024, ttl=300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    async def set(self, key, response: CachedResponse):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            "backend": "memory",
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class RedisCache:
+    """
+    Cache shared by every worker and replica, entries expire after ``ttl``.
+
+    Entries are stored as plain JSON (status, headers, base64 body), never
+    pickled, so whoever can write to Redis cannot run code in the API.
+    """
+
+    def __init__(self, url, ttl=300.0, prefix="salim:response:"):
+        if redis is None:
+            raise ImportError("redis is required for REDIS_URL: pip install redis")
+        self.client = redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key) -> Optional[CachedResponse]:
+        try:
+            data = await self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            print(f"❌ Redis cache read failed: {e}")
+            return None
+        if data is None:
+            return None
+        try:
+            return CachedResponse.from_json(data)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"❌ Ignoring malformed Redis cache entry: {e}")
+            return None
+
+    async def set(self, key, response: CachedResponse):
+        try:
+            await self.client.set(
+                self.prefix + key, response.to_json(), ex=max(1, int(self.ttl))
+            )
+        except redis.RedisError as e:
+            print(f"❌ Redis cache write failed: {e}")
+
+    def stats(self):
+        return {"backend": "redis"}
+
+
+class TieredCache:
+    """The local LRU in front of a shared cache"""
+
+    def __init__(self, local, shared):
+        self.local = local
+        self.shared = shared
+
+    async def get(self, key) -> Optional[CachedResponse]:
+        response = await self.local.get(key)
+        if response is None:
+            response = await self.shared.get(key)
+            if response is not None:
+                await self.local.set(key, response)
+        return response
+
+    async def set(self, key, response: CachedResponse):
+        await self.local.set(key, response)
+        await self.shared.set(key, response)
+
+    def stats(self):
+        return {**self.local.stats(), "shared": self.shared.stats()}
+
+
+def create_cache():
+    """The in-process LRU, backed by Redis when ``REDIS_URL`` is set"""
+    local = LRUCache(settings.response_cache_max_entries, settings.response_cache_ttl)
+    if not settings.redis_url:
+        return local
+    if redis is None:
+        print("redis is not installed, using the in-process response cache only")
+        return local
+    shared = RedisCache(settings.redis_url, settings.response_cache_ttl)
+    return TieredCache(local, shared)
+
+
+response_cache = create_cache()
@@ -0,0 +1,67 @@
+import json
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# App-wide response class: orjson when installed
+FastJSONResponse = ORJSONResponse if orjson is not None else JSONResponse
+
+# Rows encoded per streamed chunk: fewer, larger writes to the socket
+NDJSON_CHUNK_ROWS = 1000
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value) -> bytes:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+else:
+
+    def dumps(value) -> bytes:
+        return json.dumps(
+            value,
+            default=lambda v: v.isoformat() if hasattr(v, "isoformat") else _default(v),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+async def iter_ndjson(rows, chunk_rows=NDJSON_CHUNK_ROWS):
+    """Encode an (async) iterable of dicts as NDJSON, ``chunk_rows`` lines per chunk"""
+    lines = []
+    if hasattr(rows, "__aiter__"):
+        async for row in rows:
+            lines.append(dumps(row))
+            if len(lines) == chunk_rows:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+    else:
+        for row in rows:
+            lines.append(dumps(row))
+            if len(lines) == chunk_rows:
+                yield b"\n".join(lines) + b"\n"
+                lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def ndjson_response(rows, **kwargs):
+    """
+    Stream rows as ``application/x-ndjson``, one JSON object per line.
+    Only one chunk of rows is encoded at a time, so a large listing never
+    sits in memory as a whole.
+    """
+    return StreamingResponse(
+        iter_ndjson(rows), media_type="application/x-ndjson", **kwargs
+    )
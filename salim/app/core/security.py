@@ -0,0 +1,19 @@
+import secrets
+from typing import Optional
+
+from fastapi import HTTPException, Security
+from fastapi.security import APIKeyHeader
+
+from .config import settings
+
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+
+async def require_ingest_api_key(api_key: Optional[str] = Security(api_key_header)):
+    """Dependency for bulk writes: the X-API-Key header must match INGEST_API_KEY"""
+    if not settings.ingest_api_key:
+        raise HTTPException(
+            status_code=503, detail="Ingestion is disabled (no INGEST_API_KEY set)"
+        )
+    if api_key is None or not secrets.compare_digest(api_key, settings.ingest_api_key):
+        raise HTTPException(status_code=401, detail="Invalid or missing API key")
@@ -0,0 +1,12 @@
+from functools import lru_cache
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from ..core.config import settings
+
+
+@lru_cache
+def get_engine() -> Engine:
+    """Shared synchronous engine (psycopg2), created on first use"""
+    return create_engine(settings.database_url, pool_pre_ping=True)
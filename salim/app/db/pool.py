@@ -0,0 +1,131 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import asyncpg
+
+from ..core.config import settings
+
+
+class DatabasePool:
+    """
+    The app's asyncpg connection pool, opened and closed by the lifespan.
+
+    Connections are reused across requests instead of being opened per
+    request, and ``acquire()`` keeps simple counters (acquisitions, time
+    spent waiting for a free connection) for the health check. If the
+    database was down at startup, ``acquire()`` retries opening the pool at
+    most every ``db_reconnect_interval`` seconds.
+    """
+
+    def __init__(self):
+        self.pool = None
+        self.error = None
+        self.acquired = 0
+        self.acquire_wait_seconds = 0.0
+        self.max_acquire_wait_seconds = 0.0
+        self.last_connect_attempt = None
+        self._connect_lock = None
+
+    async def connect(self):
+        self.last_connect_attempt = time.monotonic()
+        try:
+            self.pool = await asyncpg.create_pool(
+                settings.database_url,
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+                statement_cache_size=settings.db_statement_cache_size,
+                command_timeout=settings.db_command_timeout,
+                max_inactive_connection_lifetime=(
+                    settings.db_max_inactive_connection_lifetime
+                ),
+            )
+            self.error = None
+            print(
+                f"✅ Database pool ready ({settings.db_pool_min_size}-"
+                f"{settings.db_pool_max_size} connections)"
+            )
+        except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+            # Keep serving; the health check reports the database as down
+            self.pool = None
+            self.error = str(e)
+            print(f"❌ Could not create database pool: {e}")
+
+    async def ensure_pool(self):
+        """True once the pool is open, reconnecting if the last attempt is old enough"""
+        if self.pool is not None:
+            return True
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            due = (
+                self.last_connect_attempt is None
+                or time.monotonic() - self.last_connect_attempt
+                >= settings.db_reconnect_interval
+            )
+            if self.pool is None and due:
+                await self.connect()
+        return self.pool is not None
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        if not await self.ensure_pool():
+            raise RuntimeError(f"Database pool is not available: {self.error}")
+        started = time.perf_counter()
+        # Raises asyncio.TimeoutError instead of queueing forever when every
+        # connection is busy
+        async with self.pool.acquire(timeout=settings.db_acquire_timeout) as connection:
+            waited = time.perf_counter() - started
+            self.acquired += 1
+            self.acquire_wait_seconds += waited
+            self.max_acquire_wait_seconds = max(self.max_acquire_wait_seconds, waited)
+            yield connection
+
+    async def stream(self, query, *args, prefetch=5000):
+        """Yield the rows of ``query`` as dicts from a server-side cursor"""
+        async with self.acquire() as connection:
+            # asyncpg cursors need a transaction
+            async with connection.transaction():
+                async for record in connection.cursor(query, *args, prefetch=prefetch):
+                    yield dict(record)
+
+    async def ping(self):
+        """Round trip of ``SELECT 1`` in ms, including acquisition and reconnecting"""
+        started = time.perf_counter()
+        async with self.acquire() as connection:
+            await connection.fetchval("SELECT 1")
+        return (time.perf_counter() - started) * 1000
+
+    def stats(self):
+        if self.pool is None:
+            return {"available": False, "error": self.error}
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "available": True,
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "acquired": self.acquired,
+            "avg_acquire_wait_ms": round(
+                self.acquire_wait_seconds / self.acquired * 1000, 3
+            ) if self.acquired else 0.0,
+            "max_acquire_wait_ms": round(self.max_acquire_wait_seconds * 1000, 3),
+            "statement_cache_size": settings.db_statement_cache_size,
+        }
+
+
+db = DatabasePool()
+
+
+async def get_connection():
+    """FastAPI dependency: a pooled connection for the duration of a request"""
+    async with db.acquire() as connection:
+        yield connection
@@ -0,0 +1,82 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Numeric,
+    Table,
+    Text,
+    UniqueConstraint,
+    func,
+)
+
+metadata = MetaData()
+
+stores = Table(
+    "stores",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("chain_id", Text, nullable=False),
+    Column("store_id", Text, nullable=False),
+    Column("name", Text),
+    UniqueConstraint("chain_id", "store_id", name="uq_stores_chain_store"),
+)
+
+items = Table(
+    "items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    # '' for barcodes, which name the same product in every chain; the
+    # chain_id for chain-internal codes, which only mean something there
+    Column("item_scope", Text, nullable=False, server_default=""),
+    Column("item_code", Text, nullable=False),
+    Column("item_name", Text),
+    Column("manufacturer_name", Text),
+    Column("quantity", Numeric),
+    Column("unit_qty", Text),
+    Column("unit_of_measure", Text),
+    UniqueConstraint("item_scope", "item_code", name="uq_items_scope_code"),
+    # pg_trgm GIN index for product search (ILIKE / similarity)
+    Index(
+        "ix_items_item_name_trgm",
+        "item_name",
+        postgresql_using="gin",
+        postgresql_ops={"item_name": "gin_trgm_ops"},
+    ),
+)
+
+prices = Table(
+    "prices",
+    metadata,
+    Column("store_pk", Integer, ForeignKey("stores.id"), primary_key=True),
+    Column("item_pk", Integer, ForeignKey("items.id"), primary_key=True),
+    Column("price", Numeric(10, 2), nullable=False),
+    Column("unit_price", Numeric(12, 4)),
+    Column("price_update_date", DateTime),
+    Column(
+        "updated_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+    # Lookups by item across stores (the primary key leads with store_pk)
+    Index("ix_prices_item_pk", "item_pk"),
+)
+
+# One row per finished ingestion; the latest id is the price data version
+ingest_runs = Table(
+    "ingest_runs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("files", Integer, nullable=False),
+    Column("rows", BigInteger, nullable=False),
+    Column(
+        "finished_at",
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    ),
+)
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from ..core.config import settings
+from .pool import db
+
+DATA_VERSION_SQL = "SELECT coalesce(max(id), 0) FROM ingest_runs"
+
+
+class DataVersion:
+    """
+    The price data version: the latest ``ingest_runs`` id.
+
+    Read from the database at most every ``check_seconds`` and bumped right
+    away by the ingest endpoint, so other workers notice a new crawl cycle
+    within one check interval.
+    """
+
+    def __init__(self, check_seconds=None):
+        self.check_seconds = (
+            settings.data_version_check_seconds
+            if check_seconds is None
+            else check_seconds
+        )
+        self.value = 0
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self):
+        return time.monotonic() - self._checked_at < self.check_seconds
+
+    async def current(self):
+        if self._fresh():
+            return self.value
+        async with self._lock:
+            if self._fresh():
+                return self.value
+            try:
+                async with db.acquire() as connection:
+                    self.value = await connection.fetchval(DATA_VERSION_SQL)
+            except Exception as e:
+                # Keep the last known version until the database is back
+                print(f"❌ Could not read data version: {e}")
+            self._checked_at = time.monotonic()
+        return self.value
+
+    def bump(self, version):
+        self.value = version
+        self._checked_at = time.monotonic()
+
+
+data_version = DataVersion()
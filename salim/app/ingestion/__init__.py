@@ -0,0 +1,5 @@
+# Price ingestion package
+from .loader import ingest_files, ingest_streams
+from .normalize import PRICE_COLUMNS, iter_price_rows
+
+__all__ = ["PRICE_COLUMNS", "ingest_files", "ingest_streams", "iter_price_rows"]
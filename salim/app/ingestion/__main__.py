@@ -0,0 +1,29 @@
+"""
+Load parsed price files into Postgres:
+
+    python -m app.ingestion prices/0084 [more files or directories] [--batch-size 50000]
+"""
+
+import argparse
+
+from .loader import ingest_files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest parsed price files (.ndjson / .parquet)"
+    )
+    parser.add_argument("paths", nargs="+", help="Files or directories to ingest")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+
+    result = ingest_files(args.paths, batch_size=args.batch_size)
+    print(
+        f"Ingested {result['rows']} rows from {len(result['files'])} files "
+        f"({len(result['failed'])} failed) in {result['elapsed_seconds']}s "
+        f"- {result['rows_per_second']} rows/s, data version {result['data_version']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import csv
+import io
+import os
+import time
+
+from ..core.config import settings
+from ..db.engine import get_engine
+from .normalize import PRICE_COLUMNS, iter_price_rows
+
+STAGING_TABLE = "staging_prices"
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    chain_id text,
+    store_id text,
+    item_code text,
+    item_type text,
+    item_name text,
+    manufacturer_name text,
+    quantity numeric,
+    unit_qty text,
+    unit_of_measure text,
+    item_price numeric,
+    unit_of_measure_price numeric,
+    price_update_date timestamp,
+    -- ItemType 0 marks a chain-internal code; without a type, anything but
+    -- an 8-14 digit barcode is treated as one
+    item_scope text GENERATED ALWAYS AS (
+        CASE
+            WHEN item_type = '0'
+                OR (item_type IS NULL AND item_code !~ '^[0-9]{{8,14}}$')
+            THEN chain_id
+            ELSE ''
+        END
+    ) STORED
+)
+"""
+
+COPY_SQL = (
+    f"COPY {STAGING_TABLE} ({', '.join(PRICE_COLUMNS)}) "
+    "FROM STDIN WITH (FORMAT csv)"
+)
+
+# Set-based upserts from the staging table. DISTINCT ON keeps the newest
+# row when one batch holds the same item (or store/item pair) twice, which
+# ON CONFLICT would otherwise reject.
+UPSERT_STORES_SQL = f"""
+INSERT INTO stores (chain_id, store_id)
+SELECT DISTINCT chain_id, store_id FROM {STAGING_TABLE}
+ON CONFLICT (chain_id, store_id) DO NOTHING
+"""
+
+UPSERT_ITEMS_SQL = f"""
+INSERT INTO items (
+    item_scope, item_code, item_name, manufacturer_name,
+    quantity, unit_qty, unit_of_measure
+)
+SELECT DISTINCT ON (item_scope, item_code)
+    item_scope, item_code, item_name, manufacturer_name,
+    quantity, unit_qty, unit_of_measure
+FROM {STAGING_TABLE}
+ORDER BY item_scope, item_code, price_update_date DESC NULLS LAST
+ON CONFLICT (item_scope, item_code) DO UPDATE SET
+    item_name = COALESCE(EXCLUDED.item_name, items.item_name),
+    manufacturer_name = COALESCE(EXCLUDED.manufacturer_name, items.manufacturer_name),
+    quantity = COALESCE(EXCLUDED.quantity, items.quantity),
+    unit_qty = COALESCE(EXCLUDED.unit_qty, items.unit_qty),
+    unit_of_measure = COALESCE(EXCLUDED.unit_of_measure, items.unit_of_measure)
+"""
+
+UPSERT_PRICES_SQL = f"""
+INSERT INTO prices (store_pk, item_pk, price, unit_price, price_update_date)
+SELECT DISTINCT ON (st.id, it.id)
+    st.id, it.id, s.item_price, s.unit_of_measure_price, s.price_update_date
+FROM {STAGING_TABLE} s
+JOIN stores st ON st.chain_id = s.chain_id AND st.store_id = s.store_id
+JOIN items it ON it.item_scope = s.item_scope AND it.item_code = s.item_code
+ORDER BY st.id, it.id, s.price_update_date DESC NULLS LAST
+ON CONFLICT (store_pk, item_pk) DO UPDATE SET
+    price = EXCLUDED.price,
+    unit_price = EXCLUDED.unit_price,
+    price_update_date = EXCLUDED.price_update_date,
+    updated_at = now()
+WHERE prices.price_update_date IS NULL
+    OR EXCLUDED.price_update_date IS NULL
+    OR EXCLUDED.price_update_date >= prices.price_update_date
+"""
+
+RECORD_RUN_SQL = "INSERT INTO ingest_runs (files, rows) VALUES (%s, %s) RETURNING id"
+
+
+def _iter_batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _to_csv(batch):
+    """Serialize one batch for COPY; None becomes an unquoted empty field (NULL)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        values = [row[column] for column in PRICE_COLUMNS]
+        writer.writerow(
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in values
+        )
+    buffer.seek(0)
+    return buffer
+
+
+def _load_batch(cursor, batch):
+    cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+    cursor.copy_expert(COPY_SQL, _to_csv(batch))
+    cursor.execute(UPSERT_STORES_SQL)
+    cursor.execute(UPSERT_ITEMS_SQL)
+    cursor.execute(UPSERT_PRICES_SQL)
+
+
+def ingest_streams(streams, batch_size=None):
+    """
+    Load parsed price files into ``stores`` / ``items`` / ``prices``.
+
+    ``streams`` is an iterable of ``(filename, fileobj)`` pairs. Rows are
+    streamed ``batch_size`` at a time into a temporary staging table with
+    ``COPY FROM STDIN`` and merged into the real tables with set-based
+    upserts, so memory stays bounded by one batch. Each file is committed
+    on its own; a finished run is recorded in ``ingest_runs``, whose id is
+    the new price data version.
+    """
+    batch_size = batch_size or settings.ingest_batch_size
+    started = time.perf_counter()
+    files = []
+    failed = []
+    total_rows = 0
+
+    connection = get_engine().raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(CREATE_STAGING_SQL)
+        connection.commit()
+
+        for filename, fileobj in streams:
+            file_started = time.perf_counter()
+            file_rows = 0
+            try:
+                rows = iter_price_rows(fileobj, filename)
+                for batch in _iter_batches(rows, batch_size):
+                    _load_batch(cursor, batch)
+                    file_rows += len(batch)
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                print(f"❌ Error ingesting {filename}: {e}")
+                failed.append({"file": filename, "error": str(e)})
+                continue
+
+            elapsed = time.perf_counter() - file_started
+            print(f"✅ Ingested {file_rows} rows from {filename} in {elapsed:.2f}s")
+            files.append(
+                {"file": filename, "rows": file_rows, "seconds": round(elapsed, 3)}
+            )
+            total_rows += file_rows
+
+        data_version = None
+        if files:
+            cursor.execute(RECORD_RUN_SQL, (len(files), total_rows))
+            data_version = cursor.fetchone()[0]
+            connection.commit()
+        cursor.close()
+    finally:
+        connection.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": files,
+        "failed": failed,
+        "rows": total_rows,
+        "data_version": data_version,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(total_rows / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def find_price_files(paths):
+    """Expand files and directories into parsed price files (.ndjson / .parquet)"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if filename.endswith((".ndjson", ".parquet")):
+                        found.append(os.path.join(root, filename))
+        else:
+            found.append(path)
+    return found
+
+
+def ingest_files(paths, batch_size=None):
+    """Ingest parsed price files (or directories of them) from disk"""
+
+    def streams():
+        for path in find_price_files(paths):
+            with open(path, "rb") as fileobj:
+                yield path, fileobj
+
+    return ingest_streams(streams(), batch_size=batch_size)
@@ -0,0 +1,122 @@
+import json
+from datetime import datetime
+
+# column -> source field in the crawler's price files
+PRICE_COLUMNS = {
+    "chain_id": "ChainId",
+    "store_id": "StoreId",
+    "item_code": "ItemCode",
+    "item_type": "ItemType",
+    "item_name": "ItemName",
+    "manufacturer_name": "ManufacturerName",
+    "quantity": "Quantity",
+    "unit_qty": "UnitQty",
+    "unit_of_measure": "UnitOfMeasure",
+    "item_price": "ItemPrice",
+    "unit_of_measure_price": "UnitOfMeasurePrice",
+    "price_update_date": "PriceUpdateDate",
+}
+
+NUMERIC_COLUMNS = {"quantity", "item_price", "unit_of_measure_price"}
+REQUIRED_COLUMNS = ("chain_id", "store_id", "item_code", "item_price")
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.strip().replace("/", "-"))
+    except ValueError:
+        return None
+
+
+def _to_text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _convert(column, value):
+    if column in NUMERIC_COLUMNS:
+        return _to_number(value)
+    if column == "price_update_date":
+        return _to_timestamp(value)
+    return _to_text(value)
+
+
+def _complete(row):
+    return all(row[column] is not None for column in REQUIRED_COLUMNS)
+
+
+def iter_ndjson_rows(lines):
+    """
+    Flat price rows from the crawler's NDJSON output: one ``{tag: value}``
+    record per line, header fields first and then ``{"Item": {...}}``.
+    Header fields are copied onto every item, matched case-insensitively
+    (chains disagree on ``StoreId`` / ``StoreID``).
+    """
+    header = {}
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        (tag, value), = json.loads(line).items()
+        if tag.lower() != "item":
+            if isinstance(value, str):
+                header[tag.lower()] = value
+            continue
+        if not isinstance(value, dict):
+            continue
+
+        fields = {key.lower(): field for key, field in value.items()}
+        row = {}
+        for column, source in PRICE_COLUMNS.items():
+            raw = fields.get(source.lower(), header.get(source.lower()))
+            row[column] = _convert(column, raw)
+        if _complete(row):
+            yield row
+
+
+def iter_parquet_rows(fileobj, batch_size=50_000):
+    """Flat price rows from the crawler's Parquet output, one batch at a time"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError(
+            "pyarrow is required to ingest Parquet files: pip install pyarrow"
+        )
+
+    parquet_file = pq.ParquetFile(fileobj)
+    columns = [c for c in PRICE_COLUMNS if c in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        for record in batch.to_pylist():
+            row = {
+                column: _convert(column, record.get(column))
+                for column in PRICE_COLUMNS
+            }
+            if _complete(row):
+                yield row
+
+
+def iter_price_rows(fileobj, filename):
+    """Flat price rows from a parsed price file (``.ndjson`` or ``.parquet``)"""
+    if filename.endswith(".parquet"):
+        return iter_parquet_rows(fileobj)
+    if filename.endswith(".ndjson"):
+        # Text or binary file objects both iterate line by line
+        return iter_ndjson_rows(fileobj)
+    raise ValueError(
+        f"Unsupported price file: {filename} (expected .ndjson or .parquet)"
+    )
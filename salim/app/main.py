@@ -1,17 +1,43 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routes.api import api_router
+from .caching import ResponseCacheMiddleware
+from .core.responses import FastJSONResponse
+from .db.pool import db
+from .routes.api import UNCACHED_PREFIXES, api_router
+from .search import ngram_index
 import uvicorn
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database pool on startup and close it on shutdown"""
+    await db.connect()
+    # Load the search fallback index (or its snapshot) in the background
+    ngram_index.current()
+    yield
+    await db.close()
+
+
 app = FastAPI(
     title="Salim API",
     description="A FastAPI server with PostgreSQL integration",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
+)
+
+# Cache GET responses per price data version, with ETags for revalidation
+app.add_middleware(
+    ResponseCacheMiddleware,
+    prefix=api_router.prefix,
+    exclude=UNCACHED_PREFIXES,
 )
 
-# Add CORS middleware
+# Add CORS middleware (outermost, so cached responses get per-request CORS headers)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
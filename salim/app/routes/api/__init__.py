@@ -1,9 +1,20 @@
 # API routes package 
 from fastapi import APIRouter
+from .basket import router as basket_router
 from .health import router as health_router
+from .ingest import router as ingest_router
+from .prices import router as prices_router
+from .products import router as products_router
 
 # Create main API router
 api_router = APIRouter(prefix="/api/v1")
 
+# GET routes under the API prefix are cached (see app/caching), except these
+UNCACHED_PREFIXES = ("/api/v1/health", "/api/v1/ingest")
+
 # Include all route modules
-api_router.include_router(health_router) 
\ No newline at end of file
+api_router.include_router(health_router)
+api_router.include_router(ingest_router)
+api_router.include_router(basket_router)
+api_router.include_router(prices_router)
+api_router.include_router(products_router) 
\ No newline at end of file
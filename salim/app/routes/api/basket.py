@@ -0,0 +1,85 @@
+from typing import List
+
+import psycopg2
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from sqlalchemy.exc import SQLAlchemyError
+
+from ...basket import price_index
+from ...caching.middleware import DATA_VERSION_HEADER
+from ...db.version import data_version
+
+router = APIRouter(prefix="/basket", tags=["basket"])
+
+
+class BasketItem(BaseModel):
+    item_code: str
+    quantity: float = Field(default=1, gt=0)
+
+
+class BasketRequest(BaseModel):
+    items: List[BasketItem] = Field(..., min_length=1, max_length=200)
+    limit: int = Field(default=5, ge=1, le=100)
+
+
+async def _cheapest(items, limit, response):
+    index = price_index.current()
+    if index is None:
+        # First request: build the index off the event loop
+        try:
+            index = await run_in_threadpool(price_index.ensure_loaded)
+        except (psycopg2.Error, SQLAlchemyError) as e:
+            print(f"❌ Could not load price index: {e}")
+            raise HTTPException(status_code=503, detail="Database is not available")
+    else:
+        if index.data_version != await data_version.current():
+            price_index.invalidate()
+        price_index.refresh_if_due()
+
+    if not index.stores:
+        raise HTTPException(
+            status_code=503, detail="No price data has been ingested yet"
+        )
+
+    basket = {}
+    for item in items:
+        basket[item.item_code] = basket.get(item.item_code, 0) + item.quantity
+
+    # Until a reload finishes this may be older than the current data version
+    response.headers[DATA_VERSION_HEADER.decode()] = str(index.data_version)
+
+    # A few hundred stores x a basket's rows: cheap enough for the event loop
+    result = index.total_basket(basket, limit=limit)
+    return {
+        "data_version": index.data_version,
+        "stores_searched": len(index.stores),
+        **result,
+    }
+
+
+@router.post("/")
+async def cheapest_basket(request: BasketRequest, response: Response):
+    """Cheapest stores for a shopping list"""
+    return await _cheapest(request.items, request.limit, response)
+
+
+@router.get("/")
+async def cheapest_basket_by_query(
+    response: Response,
+    item: List[str] = Query(
+        ..., description="Item code, optionally with a quantity: CODE or CODE:QTY"
+    ),
+    limit: int = Query(default=5, ge=1, le=100),
+):
+    """Cheapest stores for a shopping list, cacheable: ?item=CODE&item=CODE:2"""
+    items = []
+    for value in item:
+        code, _, quantity = value.partition(":")
+        try:
+            items.append(BasketItem(item_code=code, quantity=quantity or 1))
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid basket item: {value}")
+    if len(items) > 200:
+        raise HTTPException(status_code=422, detail="At most 200 items per basket")
+    return await _cheapest(items, limit, response)
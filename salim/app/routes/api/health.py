@@ -1,5 +1,8 @@
 from fastapi import APIRouter
 
+from ...caching import response_cache
+from ...db.pool import db
+
 router = APIRouter(prefix="/health", tags=["health"])
 
 @router.get("/")
@@ -14,12 +17,20 @@ async def health_check():
 @router.get("/detailed")
 async def detailed_health_check():
     """Detailed health check endpoint"""
+    database = {"status": "operational"}
+    try:
+        database["ping_ms"] = round(await db.ping(), 3)
+    except Exception as e:
+        database = {"status": "unavailable", "error": str(e)}
+    database["pool"] = db.stats()
+
     return {
-        "status": "healthy",
+        "status": "healthy" if database["status"] == "operational" else "degraded",
         "service": "salim-api",
         "version": "1.0.0",
         "components": {
             "api": "operational",
-            "database": "operational"
+            "database": database,
+            "response_cache": response_cache.stats()
         }
-    } 
\ No newline at end of file
+    }
@@ -0,0 +1,39 @@
+from typing import List
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from ...basket import price_index
+from ...core.security import require_ingest_api_key
+from ...db.version import data_version
+from ...ingestion import ingest_streams
+
+router = APIRouter(
+    prefix="/ingest",
+    tags=["ingest"],
+    dependencies=[Depends(require_ingest_api_key)],
+)
+
+
+@router.post("/")
+async def ingest_price_files(files: List[UploadFile] = File(...)):
+    """Ingest uploaded price files (.ndjson / .parquet) via COPY"""
+    for upload in files:
+        if not upload.filename:
+            raise HTTPException(status_code=422, detail="Every upload needs a filename")
+        if not upload.filename.endswith((".ndjson", ".parquet")):
+            raise HTTPException(
+                status_code=400,
+                detail=(
+                    f"Unsupported file: {upload.filename} "
+                    "(expected .ndjson or .parquet)"
+                ),
+            )
+
+    streams = [(upload.filename, upload.file) for upload in files]
+    # psycopg2 is blocking, keep it off the event loop
+    result = await run_in_threadpool(ingest_streams, streams)
+    if result["data_version"] is not None:
+        data_version.bump(result["data_version"])
+        price_index.invalidate()
+    return result
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from ...core.responses import FastJSONResponse, ndjson_response
+from ...db.pool import db
+
+router = APIRouter(prefix="/prices", tags=["prices"])
+
+PRICES_SQL = """
+SELECT p.store_pk, p.item_pk, s.chain_id, s.store_id, i.item_code, i.item_name,
+       p.price::float8 AS price, p.unit_price::float8 AS unit_price,
+       p.price_update_date
+FROM prices p
+JOIN stores s ON s.id = p.store_pk
+JOIN items i ON i.id = p.item_pk
+{where}
+ORDER BY p.store_pk, p.item_pk
+LIMIT ${limit_param}
+"""
+
+# Rows fetched per round trip while streaming
+STREAM_PREFETCH = 5000
+
+
+def parse_cursor(cursor):
+    try:
+        store_pk, item_pk = (int(part) for part in cursor.split(":"))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid cursor: {cursor}")
+    return store_pk, item_pk
+
+
+def build_query(chain_id, store_id, item_code, cursor, limit):
+    """Only the filters actually given end up in the WHERE clause"""
+    conditions = []
+    args = []
+    filters = (
+        ("s.chain_id", chain_id),
+        ("s.store_id", store_id),
+        ("i.item_code", item_code),
+    )
+    for column, value in filters:
+        if value is not None:
+            args.append(value)
+            conditions.append(f"{column} = ${len(args)}")
+    if cursor:
+        args.extend(parse_cursor(cursor))
+        conditions.append(f"(p.store_pk, p.item_pk) > (${len(args) - 1}, ${len(args)})")
+    args.append(limit)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return PRICES_SQL.format(where=where, limit_param=len(args)), args
+
+
+@router.get("/")
+async def list_prices(
+    chain_id: Optional[str] = None,
+    store_id: Optional[str] = None,
+    item_code: Optional[str] = None,
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor of the previous page"
+    ),
+    limit: int = Query(default=1000, ge=1, le=100_000),
+    format: Literal["json", "ndjson"] = "json",
+):
+    """Latest prices, ordered by store and item; format=ndjson streams the rows"""
+    if not await db.ensure_pool():
+        raise HTTPException(status_code=503, detail="Database is not available")
+    query, args = build_query(chain_id, store_id, item_code, cursor, limit)
+
+    if format == "ndjson":
+        return ndjson_response(db.stream(query, *args, prefetch=STREAM_PREFETCH))
+
+    try:
+        async with db.acquire() as connection:
+            records = await connection.fetch(query, *args)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="No database connection available")
+    rows = [dict(record) for record in records]
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = f"{rows[-1]['store_pk']}:{rows[-1]['item_pk']}"
+    # Returned as a response object, so FastAPI skips jsonable_encoder
+    return FastJSONResponse(
+        {"count": len(rows), "next_cursor": next_cursor, "data": rows}
+    )
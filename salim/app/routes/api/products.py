@@ -0,0 +1,136 @@
+import asyncio
+from typing import Literal, Optional
+
+import asyncpg
+from fastapi import APIRouter, HTTPException, Query
+
+from ...caching.middleware import DATA_VERSION_HEADER
+from ...core.config import settings
+from ...core.responses import FastJSONResponse, ndjson_response
+from ...db.pool import db
+from ...db.version import data_version
+from ...search import ngram_index
+from ...search.ngram import tokenize
+
+router = APIRouter(prefix="/products", tags=["products"])
+
+SEARCH_MAX_LIMIT = 100
+
+# Every query word must appear in the name (ILIKE, served by the pg_trgm GIN
+# index); results are ranked by trigram similarity to the whole query.
+#
+# The score is computed, not indexed: every page scores all the ILIKE matches
+# and keeps the top LIMIT after the cursor (a top-N heap sort). Pages cost the
+# same however deep they are, proportional to the number of matches, which is
+# why SEARCH_MAX_LIMIT stays small.
+SEARCH_SQL = """
+SELECT id, item_code, item_name, similarity(item_name, $1) AS score
+FROM items
+WHERE {where}
+ORDER BY score DESC, id
+LIMIT ${limit_param}
+"""
+
+
+def like_pattern(token):
+    escaped = token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def parse_cursor(cursor):
+    """``score:id`` of the last row of the previous page"""
+    try:
+        score, item_id = cursor.rsplit(":", 1)
+        return float(score), int(item_id)
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid cursor: {cursor}")
+
+
+def build_query(q, tokens, after, limit):
+    args = [q]
+    conditions = []
+    for token in tokens:
+        args.append(like_pattern(token))
+        conditions.append(f"item_name ILIKE ${len(args)}")
+    if after is not None:
+        args.extend(after)
+        score, item_id = f"${len(args) - 1}::real", f"${len(args)}"
+        conditions.append(
+            f"(similarity(item_name, $1) < {score} "
+            f"OR (similarity(item_name, $1) = {score} AND id > {item_id}))"
+        )
+    args.append(limit)
+    where = " AND ".join(conditions)
+    return SEARCH_SQL.format(where=where, limit_param=len(args)), args
+
+
+def next_cursor(rows, limit):
+    if len(rows) < limit:
+        return None
+    return f"{rows[-1]['score']!r}:{rows[-1]['id']}"
+
+
+async def search_database(query, args):
+    async with db.acquire() as connection:
+        records = await connection.fetch(
+            query, *args, timeout=settings.search_db_timeout
+        )
+    return [dict(record) for record in records]
+
+
+def search_memory(q, after, limit):
+    """Fallback rows, plus headers that keep them out of the response cache"""
+    index = ngram_index.current()
+    if index is None:
+        raise HTTPException(status_code=503, detail="Search is not available yet")
+    headers = {
+        DATA_VERSION_HEADER.decode(): str(index.data_version),
+        "Cache-Control": "no-store",
+    }
+    return index.search(q, limit=limit, after=after), headers
+
+
+@router.get("/search")
+async def search_products(
+    q: str = Query(
+        ..., min_length=2, max_length=200, description="Free-text product name"
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="next_cursor of the previous page"
+    ),
+    limit: int = Query(default=20, ge=1, le=SEARCH_MAX_LIMIT),
+    format: Literal["json", "ndjson"] = "json",
+):
+    """Search products by name; keyset-paginated, format=ndjson streams the rows"""
+    tokens = tokenize(q)
+    if not tokens:
+        raise HTTPException(status_code=422, detail="Empty search query")
+    after = parse_cursor(cursor) if cursor else None
+    query, args = build_query(q, tokens, after, limit)
+
+    # Keep the fallback index current while the database is healthy
+    ngram_index.current(await data_version.current())
+
+    # Both formats: at most SEARCH_MAX_LIMIT rows, under the same timeout and
+    # fallback
+    source = "database"
+    headers = None
+    try:
+        rows = await search_database(query, args)
+    except (asyncio.TimeoutError, asyncpg.PostgresError, OSError, RuntimeError) as e:
+        print(f"❌ Database search failed, using the n-gram index: {e}")
+        source = "memory"
+        rows, headers = search_memory(q, after, limit)
+
+    if format == "ndjson":
+        return ndjson_response(rows, headers=headers)
+    return FastJSONResponse(
+        {
+            "query": q,
+            "source": source,
+            "count": len(rows),
+            "next_cursor": next_cursor(rows, limit),
+            "data": rows,
+        },
+        headers=headers,
+    )
@@ -0,0 +1,4 @@
+# Product search package
+from .ngram import NgramIndex, NgramIndexHolder, ngram_index
+
+__all__ = ["NgramIndex", "NgramIndexHolder", "ngram_index"]
@@ -0,0 +1,253 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+
+from ..core.config import settings
+from ..db.engine import get_engine
+from ..db.version import DATA_VERSION_SQL
+
+# Only what search returns: no prices, so the index loads quickly
+ITEMS_SQL = "SELECT id, item_code, item_name FROM items ORDER BY id"
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text):
+    return _SPACES.sub(" ", (text or "").lower()).strip()
+
+
+def tokenize(query):
+    return [token for token in normalize(query).split(" ") if token]
+
+
+def trigrams(text):
+    """Trigrams of every word, padded like pg_trgm (``"  w"``, ``" wo"``, ..)"""
+    grams = set()
+    for word in text.split(" "):
+        if word:
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _inner_trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def similarity(query_grams, name_grams):
+    """pg_trgm's ``similarity()``: shared trigrams over all trigrams"""
+    if not query_grams or not name_grams:
+        return 0.0
+    shared = len(query_grams & name_grams)
+    return shared / (len(query_grams) + len(name_grams) - shared)
+
+
+class NgramIndex:
+    """
+    In-memory trigram index over item names, the fallback for product search
+    while the database is unavailable or too slow.
+
+    It answers the same question as the SQL search (names containing every
+    query word, ranked by trigram similarity) with the same ``score:id``
+    cursors. Posting lists of each word's inner trigrams narrow the
+    candidates before the substring check.
+    """
+
+    def __init__(self, data_version, item_ids, item_codes, item_names):
+        self.data_version = data_version
+        self.item_ids = item_ids
+        self.item_codes = item_codes
+        self.item_names = item_names
+        self.names = [normalize(name) for name in item_names]
+        self.postings = {}
+        for row, name in enumerate(self.names):
+            for gram in _inner_trigrams(name):
+                self.postings.setdefault(gram, []).append(row)
+
+    @classmethod
+    def load(cls, connection):
+        """Build the index from the items table (psycopg2 connection)"""
+        cursor = connection.cursor()
+        # The data version and the items from the same snapshot
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+        cursor.execute(DATA_VERSION_SQL)
+        data_version = cursor.fetchone()[0]
+        cursor.execute(ITEMS_SQL)
+        rows = cursor.fetchall()
+        cursor.close()
+        connection.rollback()
+        return cls(
+            data_version,
+            [item_id for item_id, _, _ in rows],
+            [code for _, code, _ in rows],
+            [name for _, _, name in rows],
+        )
+
+    @classmethod
+    def read(cls, path):
+        """Load a snapshot written by ``save``"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            data["data_version"],
+            data["item_ids"],
+            data["item_codes"],
+            data["item_names"],
+        )
+
+    def save(self, path):
+        """Write the items as a gzipped JSON snapshot, atomically"""
+        tmp_path = path + ".part"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "data_version": self.data_version,
+                    "item_ids": self.item_ids,
+                    "item_codes": self.item_codes,
+                    "item_names": self.item_names,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, path)
+
+    def _candidates(self, tokens):
+        grams = set()
+        for token in tokens:
+            grams |= _inner_trigrams(token)
+        if not grams:
+            # Only words shorter than three letters: check every name
+            return range(len(self.names))
+        postings = sorted((self.postings.get(gram, []) for gram in grams), key=len)
+        rows = set(postings[0])
+        for posting in postings[1:]:
+            rows.intersection_update(posting)
+            if not rows:
+                break
+        return rows
+
+    def search(self, query, limit=20, after=None):
+        """``(score, id, item_code, item_name)`` rows after the (score, id) cursor"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        query_grams = trigrams(normalize(query))
+        matches = []
+        for row in self._candidates(tokens):
+            name = self.names[row]
+            if all(token in name for token in tokens):
+                score = similarity(query_grams, trigrams(name))
+                matches.append((-score, self.item_ids[row], row))
+        matches.sort()
+
+        results = []
+        for neg_score, item_id, row in matches:
+            if after is not None and (-neg_score, -item_id) >= (after[0], -after[1]):
+                continue
+            results.append(
+                {
+                    "id": item_id,
+                    "item_code": self.item_codes[row],
+                    "item_name": self.item_names[row],
+                    "score": -neg_score,
+                }
+            )
+            if len(results) == limit:
+                break
+        return results
+
+
+class NgramIndexHolder:
+    """
+    The current n-gram index plus its reloading, in a background thread.
+
+    The index is built from a light ``items`` query and saved to
+    ``search_index_snapshot``, so a worker started while the database is down
+    still searches the last snapshot. It is rebuilt when the data version
+    changes, trying at most every ``search_index_refresh_seconds``.
+    """
+
+    def __init__(self, snapshot_path=None, refresh_seconds=None):
+        self.snapshot_path = (
+            settings.search_index_snapshot if snapshot_path is None else snapshot_path
+        )
+        self.refresh_seconds = (
+            settings.search_index_refresh_seconds
+            if refresh_seconds is None
+            else refresh_seconds
+        )
+        self._index = None
+        self._building = False
+        self._attempted_at = None
+        self._lock = threading.Lock()
+
+    def current(self, data_version=None):
+        """
+        The freshest index available now (maybe None or older); starts a
+        rebuild if there is none or it is older than ``data_version``
+        """
+        index = self._index
+        if index is None or (
+            data_version is not None and index.data_version != data_version
+        ):
+            self._start_build(data_version)
+        return index
+
+    def _start_build(self, data_version):
+        with self._lock:
+            now = time.monotonic()
+            recent = (
+                self._attempted_at is not None
+                and now - self._attempted_at < self.refresh_seconds
+            )
+            if self._building or recent:
+                return
+            self._building = True
+            self._attempted_at = now
+        threading.Thread(target=self._build, args=(data_version,), daemon=True).start()
+
+    def _read_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            started = time.perf_counter()
+            self._index = NgramIndex.read(self.snapshot_path)
+            print(
+                f"✅ Search n-gram index v{self._index.data_version} from "
+                f"{self.snapshot_path}: {len(self._index.names)} items "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+        except (OSError, ValueError, KeyError) as e:
+            print(f"❌ Could not read search index snapshot: {e}")
+
+    def _build(self, data_version):
+        try:
+            if self._index is None:
+                self._read_snapshot()
+                if self._index is not None and self._index.data_version == data_version:
+                    return
+
+            started = time.perf_counter()
+            connection = get_engine().raw_connection()
+            try:
+                index = NgramIndex.load(connection)
+            finally:
+                connection.close()
+            print(
+                f"✅ Search n-gram index v{index.data_version}: "
+                f"{len(index.names)} items in {time.perf_counter() - started:.2f}s"
+            )
+            self._index = index
+            if self.snapshot_path:
+                index.save(self.snapshot_path)
+        except Exception as e:
+            print(f"❌ Error building search n-gram index: {e}")
+        finally:
+            with self._lock:
+                self._building = False
+
+
+ngram_index = NgramIndexHolder()
@@ -0,0 +1,157 @@
+"""
+Production entry point: several worker processes behind one socket.
+
+    python -m app.serve [--workers 4] [--port 8000] [--no-preload-index]
+
+Runs gunicorn with uvicorn workers when gunicorn is installed and falls back
+to uvicorn's own process manager otherwise. uvloop and httptools are used
+when they are installed (``uvicorn[standard]``).
+"""
+
+import argparse
+import importlib.util
+import os
+
+from .core.config import settings
+
+
+def has_module(name):
+    return importlib.util.find_spec(name) is not None
+
+
+LOOP = "uvloop" if has_module("uvloop") else "asyncio"
+HTTP = "httptools" if has_module("httptools") else "h11"
+
+if has_module("gunicorn"):
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+
+    class SalimUvicornWorker(UvicornWorker):
+        """Uvicorn worker with the fastest installed event loop and HTTP parser"""
+
+        CONFIG_KWARGS = {
+            "loop": LOOP,
+            "http": HTTP,
+            "timeout_graceful_shutdown": settings.graceful_timeout,
+        }
+
+    class GunicornApplication(BaseApplication):
+        """Gunicorn configured from code instead of a config file"""
+
+        def __init__(self, options, preload_index=True):
+            self.options = options
+            self.preload_index = preload_index
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # With preload_app this runs once in the master, before forking
+            from .main import app
+
+            if self.preload_index:
+                preload_price_index()
+            return app
+else:
+    GunicornApplication = None
+
+
+def preload_price_index():
+    """
+    Build the basket price index in the master process so every forked
+    worker shares the same NumPy matrix pages copy-on-write.
+    """
+    from .basket import price_index
+    from .db.engine import get_engine
+
+    try:
+        price_index.load()
+    except Exception as e:
+        print(f"❌ Could not preload price index, workers will build it lazily: {e}")
+    finally:
+        # Never hand the master's database connections to the workers
+        get_engine().dispose()
+
+
+def default_workers():
+    return settings.web_concurrency or os.cpu_count() or 1
+
+
+def run_gunicorn(args):
+    options = {
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": "app.serve.SalimUvicornWorker",
+        "preload_app": True,
+        "keepalive": args.keep_alive,
+        "backlog": args.backlog,
+        "graceful_timeout": args.graceful_timeout,
+        "timeout": settings.worker_timeout,
+        "accesslog": "-" if args.access_log else None,
+    }
+    GunicornApplication(options, preload_index=args.preload_index).run()
+
+
+def run_uvicorn(args):
+    import uvicorn
+
+    # uvicorn spawns fresh worker processes, so nothing is preloaded
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=LOOP,
+        http=HTTP,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        access_log=args.access_log,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the Salim API with several workers"
+    )
+    parser.add_argument("--host", default=settings.host)
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--keep-alive", type=int, default=settings.keep_alive)
+    parser.add_argument("--backlog", type=int, default=settings.backlog)
+    parser.add_argument(
+        "--graceful-timeout", type=int, default=settings.graceful_timeout
+    )
+    parser.add_argument(
+        "--server",
+        choices=["gunicorn", "uvicorn"],
+        default="gunicorn" if GunicornApplication is not None else "uvicorn",
+    )
+    parser.add_argument(
+        "--no-preload-index",
+        dest="preload_index",
+        action="store_false",
+        help="Let each worker build the basket index on its first request",
+    )
+    parser.add_argument("--access-log", action="store_true")
+    args = parser.parse_args()
+
+    if args.server == "gunicorn" and GunicornApplication is None:
+        print("gunicorn is not installed, using uvicorn workers")
+        args.server = "uvicorn"
+
+    print(
+        f"🚀 Salim API on {args.host}:{args.port}: {args.workers} {args.server} "
+        f"workers, loop={LOOP}, http={HTTP}, keep-alive={args.keep_alive}s, "
+        f"backlog={args.backlog}"
+    )
+    if args.server == "gunicorn":
+        run_gunicorn(args)
+    else:
+        run_uvicorn(args)
+
+
+if __name__ == "__main__":
+    main()
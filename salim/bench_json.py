@@ -0,0 +1,109 @@
+"""
+Serialization benchmark for a 100k-row price listing.
+
+    python bench_json.py [--rows 100000]
+
+Compares FastAPI's default path (``jsonable_encoder`` + stdlib ``json``),
+orjson on the whole list, and NDJSON streamed in chunks with orjson, by time
+and by peak memory allocated while serializing (``tracemalloc``).
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import NDJSON_CHUNK_ROWS, dumps, iter_ndjson, orjson
+
+
+def price_rows(count):
+    """Rows shaped like GET /api/v1/prices"""
+    random.seed(0)
+    start = datetime(2025, 10, 18, 3, 0)
+    return [
+        {
+            "store_pk": i % 500 + 1,
+            "item_pk": i // 500 + 1,
+            "chain_id": "7290055700007",
+            "store_id": f"{i % 500:03d}",
+            "item_code": f"7290000{i:06d}",
+            "item_name": f"חלב טרי 3% {i}",
+            "price": round(random.uniform(1, 100), 2),
+            "unit_price": round(random.uniform(1, 100), 4),
+            "price_update_date": start + timedelta(minutes=i),
+        }
+        for i in range(count)
+    ]
+
+
+def stdlib_json(rows):
+    # What JSONResponse does after FastAPI's jsonable_encoder
+    content = jsonable_encoder({"data": rows})
+    encoded = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+    return encoded.encode("utf-8")
+
+
+def orjson_list(rows):
+    return dumps({"data": rows})
+
+
+def ndjson_stream(rows):
+    import asyncio
+
+    async def drain():
+        size = 0
+        async for chunk in iter_ndjson(rows):
+            size += len(chunk)  # sent to the socket and released
+        return size
+
+    return asyncio.run(drain())
+
+
+def measure(fn, rows):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(rows)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = result if isinstance(result, int) else len(result)
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark JSON serialization of price rows"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rows = price_rows(args.rows)
+    candidates = [("jsonable_encoder + json", stdlib_json)]
+    if orjson is not None:
+        candidates.append(("orjson", orjson_list))
+    else:
+        print("orjson is not installed: pip install orjson")
+    ndjson_name = f"NDJSON stream ({NDJSON_CHUNK_ROWS} rows/chunk)"
+    candidates.append((ndjson_name, ndjson_stream))
+
+    print(f"{args.rows} price rows")
+    baseline = None
+    for name, fn in candidates:
+        # Timed without tracemalloc, which slows allocations down
+        started = time.perf_counter()
+        fn(rows)
+        elapsed = time.perf_counter() - started
+        _, peak, size = measure(fn, rows)
+        baseline = baseline or elapsed
+        print(
+            f"  {name:<34} {elapsed * 1000:8.1f} ms  {baseline / elapsed:5.1f}x  "
+            f"peak {peak / 1024 / 1024:7.1f} MB  output {size / 1024 / 1024:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Load test for the Salim API (standard library only).
+
+    python loadtest.py --route health --duration 10 --connections 64
+    python loadtest.py --route basket --items 7290000000015,7290000000022
+
+Every connection is a keep-alive HTTP/1.1 connection in its own thread, and
+the threads are spread over ``--processes`` client processes so the client
+is not the bottleneck when the server runs several workers. Compare a
+single-process server with ``python -m app.serve --workers N``.
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+from urllib.parse import urlparse
+
+ROUTES = {
+    "health": ("GET", "/api/v1/health/"),
+    "health-detailed": ("GET", "/api/v1/health/detailed"),
+    "basket": ("POST", "/api/v1/basket/"),
+}
+
+
+def basket_body(item_codes):
+    return json.dumps(
+        {"items": [{"item_code": code, "quantity": 1} for code in item_codes]}
+    ).encode()
+
+
+def run_connection(url, method, path, body, deadline, latencies, errors):
+    parsed = urlparse(url)
+    headers = {"Connection": "keep-alive"}
+    if body:
+        headers["Content-Type"] = "application/json"
+    connection = None
+    while time.perf_counter() < deadline:
+        if connection is None:
+            connection = http.client.HTTPConnection(
+                parsed.hostname, parsed.port or 80, timeout=30
+            )
+        started = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = None
+            continue
+        latencies.append(time.perf_counter() - started)
+        if response.status >= 400:
+            errors.append(response.status)
+        if response.getheader("Connection", "").lower() == "close":
+            connection.close()
+            connection = None
+    if connection is not None:
+        connection.close()
+
+
+def run_process(url, method, path, body, connections, duration, results):
+    """One client process: ``connections`` keep-alive connections in threads"""
+    deadline = time.perf_counter() + duration
+    latencies = []
+    errors = []
+    threads = [
+        threading.Thread(
+            target=run_connection,
+            args=(url, method, path, body, deadline, latencies, errors),
+        )
+        for _ in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((latencies, len(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Salim API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--route", choices=sorted(ROUTES), default="health")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument(
+        "--items",
+        default="",
+        help="Comma-separated item codes for the basket route",
+    )
+    args = parser.parse_args()
+
+    method, path = ROUTES[args.route]
+    body = None
+    if args.route == "basket":
+        if not args.items:
+            parser.error("--items is required for the basket route")
+        body = basket_body(args.items.split(","))
+
+    processes = max(1, min(args.processes, args.connections))
+    per_process = [args.connections // processes] * processes
+    for i in range(args.connections % processes):
+        per_process[i] += 1
+
+    print(
+        f"{method} {args.url}{path}: {args.connections} connections, "
+        f"{processes} client processes, {args.duration:.0f}s"
+    )
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=run_process,
+            args=(args.url, method, path, body, connections, args.duration, results),
+        )
+        for connections in per_process
+    ]
+    for worker in workers:
+        worker.start()
+    latencies = []
+    errors = 0
+    for _ in workers:
+        process_latencies, process_errors = results.get()
+        latencies.extend(process_latencies)
+        errors += process_errors
+    for worker in workers:
+        worker.join()
+
+    print(f"Requests:   {len(latencies)} ({errors} errors)")
+    print(f"Throughput: {len(latencies) / args.duration:.0f} req/s")
+    if len(latencies) > 1:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        print(
+            f"Latency:    mean {statistics.mean(latencies) * 1000:.2f} ms, "
+            f"p50 {cuts[49] * 1000:.2f} ms, "
+            f"p90 {cuts[89] * 1000:.2f} ms, "
+            f"p99 {cuts[98] * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()